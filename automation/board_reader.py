@@ -3,11 +3,192 @@ Board Reader for Chess.com
 
 Reads the current board state from the chess.com DOM.
 """
-import re
+import time
 from typing import Optional
 
 import chess
+from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+
+# Piece codes used in the packed position: 0 = empty square,
+# piece_type (1-6) for White and piece_type + 6 (7-12) for Black.
+# Each chess.Piece is created once and indexed by its code.
+_PIECE_TABLE: tuple[Optional[chess.Piece], ...] = (None,) + tuple(
+    chess.Piece(piece_type, color)
+    for color in (chess.WHITE, chess.BLACK)
+    for piece_type in chess.PIECE_TYPES
+)
+
+
+def _board_from_codes(pos: bytearray) -> chess.Board:
+    """
+    Build a chess.Board from one piece code per square (see _PIECE_TABLE).
+
+    The piece and color bitboards are computed here and assigned directly,
+    instead of placing the pieces one set_piece_at() call at a time.
+    """
+    masks = [0] * 13
+    bb_squares = chess.BB_SQUARES
+    for square, code in enumerate(pos):
+        if code:
+            masks[code] |= bb_squares[square]
+
+    board = chess.Board(None)
+    board.pawns = masks[chess.PAWN] | masks[chess.PAWN + 6]
+    board.knights = masks[chess.KNIGHT] | masks[chess.KNIGHT + 6]
+    board.bishops = masks[chess.BISHOP] | masks[chess.BISHOP + 6]
+    board.rooks = masks[chess.ROOK] | masks[chess.ROOK + 6]
+    board.queens = masks[chess.QUEEN] | masks[chess.QUEEN + 6]
+    board.kings = masks[chess.KING] | masks[chess.KING + 6]
+    # The masks are disjoint, so summing them is the same as OR-ing them
+    white = sum(masks[1:7])
+    black = sum(masks[7:13])
+    board.occupied_co[chess.WHITE] = white
+    board.occupied_co[chess.BLACK] = black
+    board.occupied = white | black
+    return board
+
+
+# CSS selector for each square, indexed by chess.Square (a1 = ".square-11")
+_SQUARE_SELECTORS: tuple[str, ...] = tuple(
+    f".square-{chess.square_file(square) + 1}{chess.square_rank(square) + 1}"
+    for square in chess.SQUARES
+)
+
+
+# Page-side helpers, registered once per document as window.__chessBoard
+# (via BrowserController's init script, or lazily by BoardReader) so each
+# read only sends a short call expression instead of the full source.
+#
+# Pieces are packed as (piece code << 6) | square, or -1 if a class string
+# is not a placed piece; piece codes are the _PIECE_TABLE indices.
+#
+# snapshot(key) installs a MutationObserver (once per document) that records
+# piece changes as [old, new] packed pairs (-1 for added/removed) into one
+# queue per reader, resets that reader's queue and returns all pieces packed.
+# Both happen in the same JS task, so no mutation can fall between them.
+# drain(key) returns and clears the queue, or null if the reader must resync
+# with a snapshot (new document, or the queue overflowed).
+BOARD_HELPERS_JS = """
+(() => {
+    if (window.__chessBoard) return;
+
+    const isPiece = (classes) => !!classes && classes.split(/\\s+/).includes('piece');
+    // "square-51" (file 5, rank 1) -> chess.Square 4, or -1
+    const parseSquare = (token) => /^square-[1-8][1-8]$/.test(token)
+        ? (token.charCodeAt(8) - 49) << 3 | (token.charCodeAt(7) - 49)
+        : -1;
+    const packPiece = (classes) => {
+        if (!classes) return -1;
+        let index = -1;
+        let square = -1;
+        for (const token of classes.split(/\\s+/)) {
+            if (/^[wb][pnbrqk]$/.test(token)) {
+                index = 'pnbrqk'.indexOf(token[1]) + (token[0] === 'b' ? 7 : 1);
+            } else if (token.startsWith('square-')) {
+                square = parseSquare(token);
+            }
+        }
+        return index < 0 || square < 0 ? -1 : index << 6 | square;
+    };
+
+    const queues = {};
+    let observer = null;
+    const collect = (node, events, added) => {
+        if (node.nodeType !== 1) return;
+        const nodes = [node, ...node.getElementsByClassName('piece')];
+        for (const n of nodes) {
+            const classes = n.getAttribute('class');
+            if (!isPiece(classes)) continue;
+            const packed = packPiece(classes);
+            events.push(added ? [-1, packed] : [packed, -1]);
+        }
+    };
+    const observe = () => {
+        if (observer) return;
+        observer = new MutationObserver((mutations) => {
+            const events = [];
+            for (const m of mutations) {
+                if (m.type === 'attributes') {
+                    const classes = m.target.getAttribute('class');
+                    if (isPiece(m.oldValue) || isPiece(classes)) {
+                        events.push([packPiece(m.oldValue), packPiece(classes)]);
+                    }
+                } else {
+                    for (const n of m.removedNodes) collect(n, events, false);
+                    for (const n of m.addedNodes) collect(n, events, true);
+                }
+            }
+            if (!events.length) return;
+            for (const k of Object.keys(queues)) {
+                queues[k].push(...events);
+                // A reader that stopped draining resyncs with a full snapshot
+                if (queues[k].length > 1024) delete queues[k];
+            }
+        });
+        observer.observe(document.documentElement, {
+            subtree: true,
+            childList: true,
+            attributes: true,
+            attributeFilter: ['class'],
+            attributeOldValue: true,
+        });
+    };
+
+    window.__chessBoard = {
+        snapshot(key) {
+            observe();
+            queues[key] = [];
+            return Array.from(
+                document.getElementsByClassName('piece'),
+                (e) => packPiece(e.getAttribute('class')),
+            );
+        },
+        drain(key) {
+            const events = queues[key];
+            if (!events) return null;
+            queues[key] = [];
+            return events;
+        },
+        pending(key) {
+            const events = queues[key];
+            return !events || events.length > 0;
+        },
+        highlights() {
+            const squares = [];
+            for (const e of document.getElementsByClassName('highlight')) {
+                const classes = e.getAttribute('class');
+                if (!classes) continue;
+                for (const token of classes.split(/\\s+/)) {
+                    const square = parseSquare(token);
+                    if (square >= 0) {
+                        squares.push(square);
+                        break;
+                    }
+                }
+            }
+            return squares;
+        },
+        flipped() {
+            const board = document.querySelector('chess-board, wc-chess-board, .board');
+            if (!board) return false;
+            const classes = board.getAttribute('class');
+            return !!classes && classes.includes('flipped');
+        },
+    };
+})();
+"""
+
+# Short call expressions sent per read once the helpers are registered
+_SNAPSHOT_CALL = "(key) => window.__chessBoard.snapshot(key)"
+_DRAIN_CALL = "(key) => window.__chessBoard.drain(key)"
+_PENDING_CALL = "(key) => !window.__chessBoard || window.__chessBoard.pending(key)"
+_LAST_MOVE_CALL = (
+    "(key) => [window.__chessBoard.highlights(), window.__chessBoard.drain(key)]"
+)
+_FLIPPED_CALL = "() => window.__chessBoard.flipped()"
 
 
 class BoardReader:
@@ -17,20 +198,11 @@ class BoardReader:
     Parses piece positions from the page and converts to a python-chess Board.
     """
 
-    # Piece class to chess piece mapping
+    # Piece class to chess piece mapping (shares the _PIECE_TABLE instances)
     PIECE_MAP = {
-        "wp": chess.Piece(chess.PAWN, chess.WHITE),
-        "wn": chess.Piece(chess.KNIGHT, chess.WHITE),
-        "wb": chess.Piece(chess.BISHOP, chess.WHITE),
-        "wr": chess.Piece(chess.ROOK, chess.WHITE),
-        "wq": chess.Piece(chess.QUEEN, chess.WHITE),
-        "wk": chess.Piece(chess.KING, chess.WHITE),
-        "bp": chess.Piece(chess.PAWN, chess.BLACK),
-        "bn": chess.Piece(chess.KNIGHT, chess.BLACK),
-        "bb": chess.Piece(chess.BISHOP, chess.BLACK),
-        "br": chess.Piece(chess.ROOK, chess.BLACK),
-        "bq": chess.Piece(chess.QUEEN, chess.BLACK),
-        "bk": chess.Piece(chess.KING, chess.BLACK),
+        ("w" if piece.color else "b") + chess.piece_symbol(piece.piece_type): piece
+        for piece in _PIECE_TABLE
+        if piece is not None
     }
 
     def __init__(self, page: Page):
@@ -41,81 +213,126 @@ class BoardReader:
             page: Playwright page instance
         """
         self.page = page
+        # Position as one piece code per square, kept in sync with the page
+        self._pos = bytearray(64)
+        self._synced = False
+        # Incremented whenever the position in _pos changes
+        self.revision = 0
+        # Board built from _pos on demand; None when _pos has changed since
         self._last_board: Optional[chess.Board] = None
         self._move_history: list[chess.Move] = []
+        # Board orientation, fixed for the duration of a game
+        self._flipped: Optional[bool] = None
+        self._observer_key = f"reader-{id(self)}"
 
     async def read_board(self) -> chess.Board:
         """
         Read the current board state from chess.com.
 
+        After the first full read, only the piece changes recorded by the
+        page's MutationObserver are fetched and applied.
+
         Returns:
             A chess.Board object representing the current position
         """
-        board = chess.Board()
-        board.clear()
-
-        # Get all piece elements
-        pieces = await self.page.query_selector_all(".piece")
-
-        for piece_elem in pieces:
-            classes = await piece_elem.get_attribute("class")
-            if not classes:
-                continue
+        await self._sync_position()
 
-            # Parse piece type and square from classes
-            piece_info = self._parse_piece_classes(classes)
-            if piece_info:
-                piece, square = piece_info
-                board.set_piece_at(square, piece)
+        if self._last_board is None:
+            board = _board_from_codes(self._pos)
 
-        # Try to determine castling rights based on piece positions
-        self._infer_castling_rights(board)
+            # Try to determine castling rights based on piece positions
+            self._infer_castling_rights(board)
+            self._last_board = board
 
-        # Store for comparison
-        self._last_board = board.copy()
+        return self._last_board.copy(stack=False)
 
-        return board
+    @property
+    def observer_key(self) -> str:
+        """Key of this reader's change queue in window.__chessBoard."""
+        return self._observer_key
 
-    def _parse_piece_classes(
-        self, classes: str
-    ) -> Optional[tuple[chess.Piece, chess.Square]]:
+    async def sync_with(self, events: Optional[list[list[int]]]) -> int:
         """
-        Parse piece type and square from CSS classes.
+        Bring the position up to date from a drain() result read by the caller.
 
-        Chess.com uses classes like: "piece wk square-51"
-        - wk = white king
-        - square-51 = e1 (file 5, rank 1)
+        Lets another page call fetch this reader's piece changes in the same
+        round trip as its own data. Falls back to a full snapshot if the
+        reader isn't synced yet or the page asks for a resync (None).
 
         Args:
-            classes: CSS class string
+            events: Result of window.__chessBoard.drain(observer_key)
 
         Returns:
-            Tuple of (piece, square) or None if parsing fails
-        """
-        piece = None
-        square = None
-
-        # Find piece type (two-letter code)
-        for piece_code in self.PIECE_MAP:
-            if piece_code in classes.split():
-                piece = self.PIECE_MAP[piece_code]
-                break
-            # Also check for just the letters in the class list
-            if f" {piece_code} " in f" {classes} ":
-                piece = self.PIECE_MAP[piece_code]
-                break
-
-        # Find square (square-XY format)
-        square_match = re.search(r"square-(\d)(\d)", classes)
-        if square_match:
-            file = int(square_match.group(1)) - 1  # 1-8 to 0-7
-            rank = int(square_match.group(2)) - 1  # 1-8 to 0-7
-            if 0 <= file <= 7 and 0 <= rank <= 7:
-                square = chess.square(file, rank)
-
-        if piece is not None and square is not None:
-            return (piece, square)
-        return None
+            The revision counter after the update
+        """
+        if self._synced and events is not None:
+            self._apply_events(events)
+        else:
+            await self._snapshot_position()
+        return self.revision
+
+    async def _sync_position(self):
+        """Bring the packed position up to date with the page."""
+        if self._synced:
+            events = await self._call_helper(_DRAIN_CALL, self._observer_key)
+            if events is not None:
+                self._apply_events(events)
+                return
+
+        await self._snapshot_position()
+
+    async def _snapshot_position(self):
+        """Replace the packed position with a full read of the page."""
+        # Fetch every piece, already packed by the page, in a single round trip
+        packed_pieces = await self._call_helper(_SNAPSHOT_CALL, self._observer_key)
+
+        pos = bytearray(64)
+        for packed in packed_pieces:
+            if packed >= 0:
+                pos[packed & 63] = packed >> 6
+
+        self._synced = True
+        if pos != self._pos:
+            self._pos = pos
+            self.revision += 1
+            self._last_board = None
+
+    async def _call_helper(self, expression: str, arg=None):
+        """
+        Call one of the window.__chessBoard page helpers.
+
+        Registers the helpers on the current document first if the page was
+        not prepared by BrowserController's init script.
+        """
+        try:
+            return await self.page.evaluate(expression, arg)
+        except PlaywrightError:
+            await self.page.evaluate(BOARD_HELPERS_JS)
+            return await self.page.evaluate(expression, arg)
+
+    def _apply_events(self, events: list[list[int]]):
+        """
+        Apply observed piece changes to the packed position.
+
+        Args:
+            events: [old, new] packed pieces, -1 for added/removed
+        """
+        if not events:
+            return
+
+        pos = self._pos
+        before = bytes(pos)
+        for old_packed, new_packed in events:
+            # Only clear the square if it still holds that piece, so a
+            # capture removed after the capturer arrived is harmless
+            if old_packed >= 0 and pos[old_packed & 63] == old_packed >> 6:
+                pos[old_packed & 63] = 0
+            if new_packed >= 0:
+                pos[new_packed & 63] = new_packed >> 6
+
+        if pos != before:
+            self.revision += 1
+            self._last_board = None
 
     def _infer_castling_rights(self, board: chess.Board):
         """
@@ -124,22 +341,19 @@ class BoardReader:
         This is a heuristic - if kings and rooks are on starting squares,
         we assume castling is possible.
         """
-        # Reset castling rights
-        board.castling_rights = chess.BB_EMPTY
+        castling_rights = chess.BB_EMPTY
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
 
         # Check white castling
-        if board.piece_at(chess.E1) == chess.Piece(chess.KING, chess.WHITE):
-            if board.piece_at(chess.H1) == chess.Piece(chess.ROOK, chess.WHITE):
-                board.castling_rights |= chess.BB_H1
-            if board.piece_at(chess.A1) == chess.Piece(chess.ROOK, chess.WHITE):
-                board.castling_rights |= chess.BB_A1
+        if board.kings & white & chess.BB_E1:
+            castling_rights |= board.rooks & white & (chess.BB_A1 | chess.BB_H1)
 
         # Check black castling
-        if board.piece_at(chess.E8) == chess.Piece(chess.KING, chess.BLACK):
-            if board.piece_at(chess.H8) == chess.Piece(chess.ROOK, chess.BLACK):
-                board.castling_rights |= chess.BB_H8
-            if board.piece_at(chess.A8) == chess.Piece(chess.ROOK, chess.BLACK):
-                board.castling_rights |= chess.BB_A8
+        if board.kings & black & chess.BB_E8:
+            castling_rights |= board.rooks & black & (chess.BB_A8 | chess.BB_H8)
+
+        board.castling_rights = castling_rights
 
     async def detect_last_move(self) -> Optional[chess.Move]:
         """
@@ -148,27 +362,21 @@ class BoardReader:
         Returns:
             The last move made, or None if not detectable
         """
-        # Chess.com highlights the from and to squares of the last move
-        highlights = await self.page.query_selector_all(".highlight")
-
-        squares = []
-        for highlight in highlights:
-            classes = await highlight.get_attribute("class")
-            if classes:
-                match = re.search(r"square-(\d)(\d)", classes)
-                if match:
-                    file = int(match.group(1)) - 1
-                    rank = int(match.group(2)) - 1
-                    if 0 <= file <= 7 and 0 <= rank <= 7:
-                        squares.append(chess.square(file, rank))
+        # Chess.com highlights the from and to squares of the last move.
+        # Fetch them together with the pending piece changes in one round trip.
+        squares, events = await self._call_helper(_LAST_MOVE_CALL, self._observer_key)
+        in_sync = self._synced and events is not None
+        if in_sync:
+            self._apply_events(events)
 
         if len(squares) == 2:
             # Determine which is from/to based on piece positions
-            board = await self.read_board()
+            if not in_sync:
+                await self._sync_position()
             # The destination square should have a piece
-            if board.piece_at(squares[1]):
+            if self._pos[squares[1]]:
                 return chess.Move(squares[0], squares[1])
-            elif board.piece_at(squares[0]):
+            elif self._pos[squares[0]]:
                 return chess.Move(squares[1], squares[0])
 
         return None
@@ -177,19 +385,20 @@ class BoardReader:
         """
         Check if the board is flipped (playing as Black).
 
+        The orientation does not change mid-game, so it is read once and
+        cached until reset() is called.
+
         Returns:
             True if board is flipped (Black's perspective)
         """
-        # Check for flipped class on board element
-        board_elem = await self.page.query_selector("chess-board, wc-chess-board, .board")
-        if board_elem:
-            classes = await board_elem.get_attribute("class")
-            if classes and "flipped" in classes:
-                return True
+        if self._flipped is None:
+            # Check for flipped class on board element
+            self._flipped = await self._call_helper(_FLIPPED_CALL)
+        return self._flipped
 
-        # Alternative: check if white pieces are at top
-        # by looking at square-18 (a8) - should have white pieces if flipped
-        return False
+    def reset(self):
+        """Forget per-game cached state (board orientation) for a new game."""
+        self._flipped = None
 
     async def get_fen(self) -> str:
         """
@@ -211,9 +420,7 @@ class BoardReader:
         Returns:
             CSS selector for that square
         """
-        file = chess.square_file(square) + 1  # 0-7 to 1-8
-        rank = chess.square_rank(square) + 1  # 0-7 to 1-8
-        return f".square-{file}{rank}"
+        return _SQUARE_SELECTORS[square]
 
     async def wait_for_board_change(self, timeout: float = 30.0) -> bool:
         """
@@ -225,15 +432,26 @@ class BoardReader:
         Returns:
             True if board changed, False if timeout
         """
-        import asyncio
-
-        start_fen = self._last_board.fen() if self._last_board else None
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_board = await self.read_board()
-            if start_fen is None or current_board.fen() != start_fen:
+        if not self._synced:
+            # Nothing to compare against yet
+            await self._sync_position()
+            return True
+
+        start_pos = bytes(self._pos)
+        deadline = time.monotonic() + timeout
+
+        while (remaining := deadline - time.monotonic()) > 0:
+            # Let the browser evaluate the predicate on each animation frame;
+            # Python stays idle until the observer has queued piece events
+            try:
+                await self.page.wait_for_function(
+                    _PENDING_CALL, arg=self._observer_key, timeout=remaining * 1000
+                )
+            except PlaywrightTimeoutError:
+                return False
+
+            await self._sync_position()
+            if self._pos != start_pos:
                 return True
-            await asyncio.sleep(0.2)
 
         return False
@@ -9,6 +9,19 @@ from pathlib import Path
 from typing import Optional
 
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .board_reader import BOARD_HELPERS_JS
+from .game_detector import GAME_STATE_JS
+
+# Selectors that identify the chess board across chess.com page layouts
+_BOARD_SELECTORS = (
+    "chess-board",
+    "wc-chess-board",
+    ".board",
+    "#board-single",
+    '[class*="board"]',
+)
 
 
 class BrowserController:
@@ -82,16 +95,18 @@ class BrowserController:
         """
         )
 
+        # Register the board-reading and game-state helpers once per document
+        await self.page.add_init_script(BOARD_HELPERS_JS)
+        await self.page.add_init_script(GAME_STATE_JS)
+
         # Navigate to chess.com with longer timeout and simpler wait
         try:
             await self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
         except Exception as e:
             print(f"Initial navigation warning (may be ok): {e}")
 
-        # Give page time to settle after any redirects
-        await asyncio.sleep(2)
-
-        # Wait for page to be ready
+        # Wait for page to be ready (resolves at once if goto already got there);
+        # callers wait for the board element itself via wait_for_board()
         try:
             await self.page.wait_for_load_state("domcontentloaded", timeout=30000)
         except Exception:
@@ -108,26 +123,15 @@ class BrowserController:
         Args:
             timeout: Maximum time to wait in milliseconds
         """
-        # Try different selectors for the board
-        selectors = [
-            "chess-board",
-            "wc-chess-board",
-            ".board",
-            "#board-single",
-            '[class*="board"]',
-        ]
-
-        for selector in selectors:
-            try:
-                await self.page.wait_for_selector(
-                    selector, timeout=timeout / len(selectors)
-                )
-                print(f"Found chess board with selector: {selector}")
-                return
-            except Exception:
-                continue
+        # Match any of the board selectors in a single DOM traversal
+        try:
+            await self.page.wait_for_selector(
+                ", ".join(_BOARD_SELECTORS), timeout=timeout
+            )
+        except Exception:
+            raise TimeoutError("Could not find chess board on page")
 
-        raise TimeoutError("Could not find chess board on page")
+        print("Found chess board")
 
     async def wait_for_stable_page(self, timeout: float = 10.0):
         """
@@ -136,15 +140,13 @@ class BrowserController:
         Args:
             timeout: Maximum time to wait in seconds
         """
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            try:
-                # Check if page is still navigating
-                await self.page.wait_for_load_state("domcontentloaded", timeout=1000)
-                return
-            except Exception:
-                await asyncio.sleep(0.5)
+        # Resolves as soon as the state is reached, so no polling is needed
+        try:
+            await self.page.wait_for_load_state(
+                "domcontentloaded", timeout=timeout * 1000
+            )
+        except PlaywrightTimeoutError:
+            pass
 
     async def get_page(self) -> Page:
         """Get the current page instance."""
@@ -184,6 +186,7 @@ class BrowserController:
         if self.page:
             try:
                 await self.page.reload(wait_until="domcontentloaded", timeout=30000)
+                await self.wait_for_board(timeout=30000)
             except Exception as e:
                 print(f"Refresh warning: {e}")
 
@@ -4,12 +4,120 @@ Game Detector for Chess.com
 Detects game state, player color, and turn information.
 """
 import asyncio
+import re
+import time
 from enum import Enum
 from typing import Optional, Tuple
 
 import chess
 from playwright.async_api import Page
 
+from .board_reader import BoardReader
+
+# Page-side helper, registered once per document as window.__chessGame
+# (via BrowserController's init script, or lazily by GameDetector) so each
+# poll only sends a short call expression instead of the full source.
+#
+# state() reads everything the detector needs from the page in one round
+# trip. The cursor probe (getComputedStyle per piece) only runs when the
+# clock does not already say it is our turn.
+GAME_STATE_JS = """
+(() => {
+    if (window.__chessGame) return;
+
+    const BOARD = 'chess-board, wc-chess-board, .board';
+    const WEB_BOARD = 'chess-board, wc-chess-board';
+    const GAME_OVER = ".game-over-modal, .game-review-modal, [class*='game-over'], .modal-game-over";
+    const SEEKING = ".seeking-component, .challenge-component, [class*='seeking']";
+    const RESULT = ".result, .game-result, [class*='result']";
+    const OUR_CLOCK = '.clock-bottom.clock-player-turn, .clock-component.clock-bottom.clock-running';
+    const BOTTOM_CLOCK = '.clock-bottom .clock-time';
+    const TOP_CLOCK = '.clock-top .clock-time';
+
+    const text = (selector) => {
+        const el = document.querySelector(selector);
+        return el ? el.innerText : null;
+    };
+
+    window.__chessGame = {
+        state() {
+            const board = document.querySelector(BOARD);
+            const boardClasses = board ? board.getAttribute('class') || '' : '';
+
+            let gameOverText = null;
+            const modal = document.querySelector(GAME_OVER);
+            if (modal) gameOverText = modal.innerText || '';
+
+            const ourClock = !!document.querySelector(OUR_CLOCK);
+
+            let interactive = false;
+            const webBoard = document.querySelector(WEB_BOARD);
+            if (!ourClock && webBoard) {
+                // Check if we can interact with pieces
+                for (const piece of webBoard.getElementsByClassName('piece')) {
+                    const style = window.getComputedStyle(piece);
+                    if (style.cursor === 'grab' || style.cursor === 'pointer') {
+                        interactive = true;
+                        break;
+                    }
+                }
+            }
+
+            const indicator = document.querySelector('.move-indicator');
+
+            return {
+                board_found: !!board,
+                flipped: boardClasses.includes('flipped'),
+                piece_count: document.getElementsByClassName('piece').length,
+                seeking: !!document.querySelector(SEEKING),
+                game_over_text: gameOverText,
+                result_text: text(RESULT),
+                our_clock: ourClock,
+                interactive: interactive,
+                move_indicator: indicator ? indicator.getAttribute('class') : null,
+                bottom_clock: text(BOTTOM_CLOCK),
+                top_clock: text(TOP_CLOCK),
+            };
+        },
+    };
+})();
+"""
+
+# Short call expression sent per poll once the helper is registered
+_STATE_CALL = "() => window.__chessGame.state()"
+
+# State plus a BoardReader's pending piece changes (see BOARD_HELPERS_JS),
+# for poll(); a missing board helper yields null, which makes the reader
+# resync on its own
+_POLL_CALL = (
+    "(key) => [window.__chessGame.state(),"
+    " window.__chessBoard ? window.__chessBoard.drain(key) : null]"
+)
+
+# How long (seconds) a state snapshot is shared between callers
+_SNAPSHOT_TTL = 0.1
+
+# Poll interval bounds (seconds) for the wait loops; the interval grows by
+# _POLL_BACKOFF after each unchanged poll and resets when something changes
+_POLL_MIN_INTERVAL = 0.1
+_POLL_MAX_INTERVAL = 1.0
+_POLL_BACKOFF = 1.5
+
+# State reported when the page cannot be read (e.g. mid-navigation)
+_EMPTY_STATE = {
+    "board_found": False,
+    "flipped": False,
+    "piece_count": 0,
+    "seeking": False,
+    "game_over_text": None,
+    "result_text": None,
+    "our_clock": False,
+    "interactive": False,
+    "move_indicator": None,
+    "bottom_clock": None,
+    "top_clock": None,
+}
+
 
 class GameState(Enum):
     """Possible game states."""
@@ -29,6 +137,21 @@ class GameResult(Enum):
     ONGOING = "ongoing"
 
 
+# Every result-text token _parse_result_text cares about, found in one scan
+_RESULT_RE = re.compile(
+    r"white|black|win|won|1-0|0-1|1/2|draw|stalemate", re.IGNORECASE
+)
+
+# Result markers checked in order against the tokens found in result text
+_RESULT_KEYWORDS: Tuple[Tuple[str, GameResult], ...] = (
+    ("1-0", GameResult.WHITE_WINS),
+    ("0-1", GameResult.BLACK_WINS),
+    ("draw", GameResult.DRAW),
+    ("1/2", GameResult.DRAW),
+    ("stalemate", GameResult.DRAW),
+)
+
+
 class GameDetector:
     """
     Detects game-related information from chess.com.
@@ -50,67 +173,79 @@ class GameDetector:
         self.page = page
         self._player_color: Optional[bool] = None
         self._game_state = GameState.NO_GAME
+        # Last (timestamp, state) read; callers within _SNAPSHOT_TTL share it
+        self._snapshot_cache: Optional[Tuple[float, dict]] = None
+        self._snapshot_lock = asyncio.Lock()
+        # Reused across waits so board reads stay incremental
+        self._board_reader = BoardReader(page)
+
+    async def _call_helper(self, expression: str, arg=None):
+        """
+        Call the window.__chessGame page helper, handling navigation errors.
 
-    async def _safe_query_selector(self, selector: str):
-        """Safely query selector, handling navigation errors."""
+        Registers the helper on the current document first if the page was
+        not prepared by BrowserController's init script.
+        """
         try:
-            return await self.page.query_selector(selector)
+            return await self.page.evaluate(expression, arg)
         except Exception:
-            await asyncio.sleep(0.3)
             try:
-                return await self.page.query_selector(selector)
+                await self.page.evaluate(GAME_STATE_JS)
+                return await self.page.evaluate(expression, arg)
             except Exception:
                 return None
 
-    async def _safe_query_selector_all(self, selector: str):
-        """Safely query all selectors, handling navigation errors."""
-        try:
-            return await self.page.query_selector_all(selector)
-        except Exception:
-            await asyncio.sleep(0.3)
-            try:
-                return await self.page.query_selector_all(selector)
-            except Exception:
-                return []
+    async def _snapshot(self) -> dict:
+        """
+        Read the detector's view of the page in a single evaluate.
 
-    async def _safe_evaluate(self, expression: str, default=None):
-        """Safely evaluate JS, handling navigation errors."""
-        try:
-            return await self.page.evaluate(expression)
-        except Exception:
-            return default
+        Snapshots are reused for _SNAPSHOT_TTL seconds, and concurrent
+        callers wait for the read already in flight instead of issuing
+        their own.
+
+        Returns:
+            Dict of board, game-over, turn and clock fields (see GAME_STATE_JS)
+        """
+        cached = self._snapshot_cache
+        if cached is not None and time.monotonic() - cached[0] < _SNAPSHOT_TTL:
+            return cached[1]
+
+        async with self._snapshot_lock:
+            # Another caller may have refreshed it while we waited
+            cached = self._snapshot_cache
+            if cached is not None and time.monotonic() - cached[0] < _SNAPSHOT_TTL:
+                return cached[1]
+
+            state = await self._call_helper(_STATE_CALL)
+            if state is None:
+                # Page may be navigating; retry once before giving up
+                await asyncio.sleep(0.3)
+                state = await self._call_helper(_STATE_CALL)
+            if state is None:
+                # Don't cache a failed read
+                return _EMPTY_STATE
+
+            self._snapshot_cache = (time.monotonic(), state)
+            return state
 
     async def detect_player_color(self) -> bool:
         """
         Detect which color the player is.
 
+        The board orientation is fixed for a game, so the result is cached
+        until wait_for_game_start looks for the next game.
+
         Returns:
             chess.WHITE or chess.BLACK
         """
-        # Check if board is flipped
-        board_elem = await self._safe_query_selector(
-            "chess-board, wc-chess-board, .board"
-        )
+        if self._player_color is not None:
+            return self._player_color
 
-        if board_elem:
-            try:
-                classes = await board_elem.get_attribute("class")
-                if classes and "flipped" in classes:
-                    self._player_color = chess.BLACK
-                    return chess.BLACK
-            except Exception:
-                pass
-
-        # Alternative: check player name positions
-        # On chess.com, your username appears at the bottom
-        bottom_player = await self._safe_query_selector(
-            ".player-component.player-bottom .user-username-component"
-        )
-
-        if bottom_player:
-            # If there's a bottom player element, we're playing
-            # Check board orientation again
-            pass
+        # Check if board is flipped
+        state = await self._snapshot()
+        if state["flipped"]:
+            self._player_color = chess.BLACK
+            return chess.BLACK
 
         self._player_color = chess.WHITE
         return chess.WHITE
@@ -125,50 +260,25 @@ class GameDetector:
         Returns:
             True if it's our turn
         """
-        # Method 1: Check for clock highlighting
-        clock_selector = ".clock-bottom.clock-player-turn, .clock-component.clock-bottom.clock-running"
-        our_clock = await self._safe_query_selector(clock_selector)
+        state = await self._snapshot()
 
-        if our_clock:
+        # Method 1: Check for clock highlighting
+        if state["our_clock"]:
             return True
 
         # Method 2: Check if board is interactive
         # When it's not our turn, pieces may not be draggable
-        is_interactive = await self._safe_evaluate(
-            """
-            () => {
-                const board = document.querySelector('chess-board, wc-chess-board');
-                if (!board) return false;
-
-                // Check if we can interact with pieces
-                const pieces = board.querySelectorAll('.piece');
-                for (const piece of pieces) {
-                    const style = window.getComputedStyle(piece);
-                    if (style.cursor === 'grab' || style.cursor === 'pointer') {
-                        return true;
-                    }
-                }
-                return false;
-            }
-        """,
-            default=False,
-        )
-        if is_interactive:
+        if state["interactive"]:
             return True
 
         # Method 3: Check move indicator
-        move_indicator = await self._safe_query_selector(".move-indicator")
-        if move_indicator:
-            try:
-                classes = await move_indicator.get_attribute("class")
-                if classes:
-                    # The move indicator shows whose turn it is
-                    if "white" in classes.lower():
-                        return player_color == chess.WHITE
-                    elif "black" in classes.lower():
-                        return player_color == chess.BLACK
-            except Exception:
-                pass
+        classes = state["move_indicator"]
+        if classes:
+            # The move indicator shows whose turn it is
+            if "white" in classes.lower():
+                return player_color == chess.WHITE
+            elif "black" in classes.lower():
+                return player_color == chess.BLACK
 
         # Default: assume it might not be our turn
         return False
@@ -186,9 +296,14 @@ class GameDetector:
         print("Waiting for game to start...")
         print("(Navigate to a game on chess.com or start a new game)")
 
-        start_time = asyncio.get_event_loop().time()
+        # A new game may be played with the other color
+        self._player_color = None
 
-        while asyncio.get_event_loop().time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        interval = _POLL_MIN_INTERVAL
+        last_state = None
+
+        while (remaining := deadline - time.monotonic()) > 0:
             try:
                 state = await self.get_game_state()
 
@@ -196,11 +311,17 @@ class GameDetector:
                     print("Game started!")
                     self._game_state = GameState.IN_PROGRESS
                     return True
+
+                # Poll quickly again right after the page changes state
+                if state != last_state:
+                    interval = _POLL_MIN_INTERVAL
+                    last_state = state
             except Exception as e:
                 # Handle navigation/context errors gracefully
                 pass
 
-            await asyncio.sleep(0.5)
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * _POLL_BACKOFF, _POLL_MAX_INTERVAL)
 
         return False
 
@@ -211,30 +332,19 @@ class GameDetector:
         Returns:
             GameState enum value
         """
+        state = await self._snapshot()
+
         # Check for game over modal
-        game_over = await self._safe_query_selector(
-            ".game-over-modal, .game-review-modal, [class*='game-over']"
-        )
-        if game_over:
+        if state["game_over_text"] is not None:
             return GameState.GAME_OVER
 
-        # Check for active game
-        board = await self._safe_query_selector(
-            "chess-board, wc-chess-board, .board"
-        )
-
-        if board:
-            # Check if there are pieces on the board
-            pieces = await self._safe_query_selector_all(".piece")
-            if len(pieces) > 0:
-                # Check for waiting state (seeking game)
-                seeking = await self._safe_query_selector(
-                    ".seeking-component, .challenge-component, [class*='seeking']"
-                )
-                if seeking:
-                    return GameState.WAITING
+        # Check for active game with pieces on the board
+        if state["board_found"] and state["piece_count"] > 0:
+            # Check for waiting state (seeking game)
+            if state["seeking"]:
+                return GameState.WAITING
 
-                return GameState.IN_PROGRESS
+            return GameState.IN_PROGRESS
 
         return GameState.NO_GAME
 
@@ -245,62 +355,66 @@ class GameDetector:
         Returns:
             Tuple of (is_over, result)
         """
+        return self._game_over(await self._snapshot())
+
+    async def poll(
+        self, board_reader: BoardReader
+    ) -> Tuple[bool, Optional[GameResult], int]:
+        """
+        Check if the game is over and sync a board reader, in one round trip.
+
+        The state read also refreshes the snapshot cache, so other checks
+        within _SNAPSHOT_TTL reuse it.
+
+        Args:
+            board_reader: Reader whose piece changes to fetch and apply
+
+        Returns:
+            Tuple of (is_over, result, the reader's board revision)
+        """
+        polled = await self._call_helper(_POLL_CALL, board_reader.observer_key)
+        if polled is None:
+            state, events = _EMPTY_STATE, None
+        else:
+            state, events = polled
+            self._snapshot_cache = (time.monotonic(), state)
+
+        revision = await board_reader.sync_with(events)
+        is_over, result = self._game_over(state)
+        return is_over, result, revision
+
+    def _game_over(self, state: dict) -> Tuple[bool, Optional[GameResult]]:
+        """Determine (is_over, result) from a state snapshot."""
         # Check for game over modal
-        game_over_selectors = [
-            ".game-over-modal",
-            ".game-review-modal",
-            "[class*='game-over']",
-            ".modal-game-over",
-        ]
-
-        for selector in game_over_selectors:
-            modal = await self._safe_query_selector(selector)
-            if modal:
-                result = await self._parse_game_result(modal)
-                return True, result
+        if state["game_over_text"] is not None:
+            return True, self._parse_result_text(state["game_over_text"])
 
         # Check for game end in move list
-        result_elem = await self._safe_query_selector(
-            ".result, .game-result, [class*='result']"
-        )
-        if result_elem:
-            try:
-                text = await result_elem.inner_text()
-                if text:
-                    result = self._parse_result_text(text)
-                    if result != GameResult.ONGOING:
-                        return True, result
-            except Exception:
-                pass
+        text = state["result_text"]
+        if text:
+            result = self._parse_result_text(text)
+            if result != GameResult.ONGOING:
+                return True, result
 
         return False, None
 
-    async def _parse_game_result(self, modal) -> GameResult:
-        """Parse the game result from the game over modal."""
-        try:
-            text = await modal.inner_text()
-            return self._parse_result_text(text)
-        except Exception:
-            return GameResult.ONGOING
-
     def _parse_result_text(self, text: str) -> GameResult:
         """Parse result from text."""
-        text = text.lower()
-
-        if "white" in text and ("win" in text or "won" in text):
-            return GameResult.WHITE_WINS
-        elif "black" in text and ("win" in text or "won" in text):
-            return GameResult.BLACK_WINS
-        elif "1-0" in text:
-            return GameResult.WHITE_WINS
-        elif "0-1" in text:
-            return GameResult.BLACK_WINS
-        elif "draw" in text or "1/2" in text or "stalemate" in text:
-            return GameResult.DRAW
-        elif "checkmate" in text:
-            # Need more context to determine winner
+        found = {token.lower() for token in _RESULT_RE.findall(text)}
+        if not found:
             return GameResult.ONGOING
 
+        if "win" in found or "won" in found:
+            if "white" in found:
+                return GameResult.WHITE_WINS
+            if "black" in found:
+                return GameResult.BLACK_WINS
+
+        for keyword, result in _RESULT_KEYWORDS:
+            if keyword in found:
+                return result
+
+        # A bare "checkmate" needs more context to determine the winner
         return GameResult.ONGOING
 
     async def wait_for_opponent_move(
@@ -316,12 +430,12 @@ class GameDetector:
         Returns:
             True if opponent moved, False if timeout or game over
         """
-        from .board_reader import BoardReader
-
-        board_reader = BoardReader(self.page)
-        start_time = asyncio.get_event_loop().time()
+        board_reader = self._board_reader
+        deadline = time.monotonic() + timeout
+        # Parse the placement once; each check is then a bitboard comparison
+        current_placement = chess.BaseBoard(current_fen.split()[0])
 
-        while asyncio.get_event_loop().time() - start_time < timeout:
+        while (remaining := deadline - time.monotonic()) > 0:
             # Check if game is over
             is_over, _ = await self.is_game_over()
             if is_over:
@@ -330,12 +444,21 @@ class GameDetector:
             # Check if board has changed
             try:
                 new_board = await board_reader.read_board()
-                if new_board.fen().split()[0] != current_fen.split()[0]:
+                if current_placement != new_board:
                     return True
             except Exception:
-                pass
+                await asyncio.sleep(min(_POLL_MIN_INTERVAL, remaining))
+                continue
 
-            await asyncio.sleep(0.3)
+            # Block in the page until its MutationObserver reports piece
+            # changes, waking at least every _POLL_MAX_INTERVAL to recheck
+            # for game over
+            try:
+                await board_reader.wait_for_board_change(
+                    timeout=min(_POLL_MAX_INTERVAL, remaining)
+                )
+            except Exception:
+                await asyncio.sleep(min(_POLL_MIN_INTERVAL, remaining))
 
         return False
 
@@ -349,21 +472,13 @@ class GameDetector:
         our_time = None
         opp_time = None
 
-        try:
-            # Get bottom clock (our clock)
-            bottom_clock = await self._safe_query_selector(".clock-bottom .clock-time")
-            if bottom_clock:
-                time_text = await bottom_clock.inner_text()
-                our_time = self._parse_time(time_text)
-
-            # Get top clock (opponent's clock)
-            top_clock = await self._safe_query_selector(".clock-top .clock-time")
-            if top_clock:
-                time_text = await top_clock.inner_text()
-                opp_time = self._parse_time(time_text)
+        state = await self._snapshot()
 
-        except Exception:
-            pass
+        # Bottom clock is ours, top clock is the opponent's
+        if state["bottom_clock"]:
+            our_time = self._parse_time(state["bottom_clock"])
+        if state["top_clock"]:
+            opp_time = self._parse_time(state["top_clock"])
 
         return our_time, opp_time
 
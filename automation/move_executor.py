@@ -5,11 +5,35 @@ Executes chess moves by clicking on the board.
 """
 import asyncio
 import random
-from typing import Optional, Tuple
+import re
+from typing import Optional
 
 import chess
 from playwright.async_api import Page
 
+from .board_reader import _SQUARE_SELECTORS
+
+# Matches the file and rank digits of a square class, e.g. "square-54"
+_SQUARE_RE = re.compile(r"square-(\d)(\d)")
+
+# Union selector for each promotion piece in the promotion dialog
+_PROMOTION_SELECTORS: dict[chess.PieceType, str] = {
+    piece_type: ", ".join(
+        (
+            f".promotion-piece.{name}",
+            f".promotion-{name}",
+            f'[class*="promotion"][class*="{name}"]',
+            f".promotion-menu .{name}",
+        )
+    )
+    for piece_type, name in (
+        (chess.QUEEN, "queen"),
+        (chess.ROOK, "rook"),
+        (chess.BISHOP, "bishop"),
+        (chess.KNIGHT, "knight"),
+    )
+}
+
 
 class MoveExecutor:
     """
@@ -39,7 +63,7 @@ class MoveExecutor:
     async def make_move(
         self,
         move: chess.Move,
-        is_flipped: bool = False,
+        is_flipped: Optional[bool] = None,
         delay: bool = True,
     ) -> bool:
         """
@@ -47,7 +71,8 @@ class MoveExecutor:
 
         Args:
             move: The chess move to make
-            is_flipped: Whether the board is flipped (playing as Black)
+            is_flipped: Whether the board is flipped (playing as Black),
+                        or None to read it from the page if needed
             delay: Whether to add human-like delay before moving
 
         Returns:
@@ -64,13 +89,13 @@ class MoveExecutor:
 
         try:
             # Click the source square
-            await self._click_square(from_selector)
+            await self._click_square(from_selector, is_flipped)
 
             # Small delay between clicks (human-like)
             await asyncio.sleep(random.uniform(0.1, 0.3))
 
             # Click the destination square
-            await self._click_square(to_selector)
+            await self._click_square(to_selector, is_flipped)
 
             # Handle pawn promotion
             if move.promotion:
@@ -82,12 +107,13 @@ class MoveExecutor:
             print(f"Error making move {move}: {e}")
             return False
 
-    async def _click_square(self, selector: str):
+    async def _click_square(self, selector: str, is_flipped: Optional[bool] = None):
         """
         Click a square on the chess board.
 
         Args:
             selector: CSS selector for the square
+            is_flipped: Board orientation, or None to read it from the page
         """
         # Try to find and click the square
         # Chess.com uses different structures, try multiple approaches
@@ -103,8 +129,7 @@ class MoveExecutor:
         if element is None:
             # Try with different selector format
             # Extract square numbers from selector like ".square-54"
-            import re
-            match = re.search(r"square-(\d)(\d)", selector)
+            match = _SQUARE_RE.search(selector)
             if match:
                 file, rank = match.groups()
                 alt_selector = f'[class*="square-{file}{rank}"]'
@@ -121,18 +146,22 @@ class MoveExecutor:
                 return
 
         # Fallback: try clicking by coordinates based on board position
-        await self._click_by_board_position(selector)
+        await self._click_by_board_position(selector, is_flipped)
 
-    async def _click_by_board_position(self, selector: str):
+    async def _click_by_board_position(
+        self, selector: str, is_flipped: Optional[bool] = None
+    ):
         """
         Click a square by calculating its position on the board.
 
         Fallback method when selectors don't work.
-        """
-        import re
 
+        Args:
+            selector: CSS selector for the square
+            is_flipped: Board orientation, or None to read it from the page
+        """
         # Extract file and rank from selector
-        match = re.search(r"square-(\d)(\d)", selector)
+        match = _SQUARE_RE.search(selector)
         if not match:
             raise ValueError(f"Invalid square selector: {selector}")
 
@@ -151,9 +180,10 @@ class MoveExecutor:
         if not box:
             raise RuntimeError("Could not get board bounding box")
 
-        # Check if board is flipped
-        classes = await board.get_attribute("class") or ""
-        is_flipped = "flipped" in classes
+        # Check if board is flipped (unless the caller already knows)
+        if is_flipped is None:
+            classes = await board.get_attribute("class") or ""
+            is_flipped = "flipped" in classes
 
         # Calculate square position
         square_width = box["width"] / 8
@@ -181,35 +211,17 @@ class MoveExecutor:
         Args:
             promotion_piece: The piece type to promote to
         """
-        # Wait for promotion dialog
-        await asyncio.sleep(0.3)
-
-        # Map piece type to class name
-        piece_names = {
-            chess.QUEEN: "queen",
-            chess.ROOK: "rook",
-            chess.BISHOP: "bishop",
-            chess.KNIGHT: "knight",
-        }
-
-        piece_name = piece_names.get(promotion_piece, "queen")
-
-        # Try different selectors for promotion dialog
-        selectors = [
-            f".promotion-piece.{piece_name}",
-            f".promotion-{piece_name}",
-            f'[class*="promotion"][class*="{piece_name}"]',
-            f'.promotion-menu .{piece_name}',
-        ]
-
-        for selector in selectors:
-            try:
-                element = await self.page.query_selector(selector)
-                if element:
-                    await element.click()
-                    return
-            except Exception:
-                continue
+        selector = _PROMOTION_SELECTORS.get(
+            promotion_piece, _PROMOTION_SELECTORS[chess.QUEEN]
+        )
+
+        try:
+            # One query for all the dialog layouts; the click waits for the
+            # promotion dialog to appear
+            await self.page.locator(selector).first.click(timeout=1000)
+            return
+        except Exception:
+            pass
 
         # Fallback: try clicking at a position in the promotion menu
         print(f"Warning: Could not find promotion piece selector, trying fallback")
@@ -224,9 +236,7 @@ class MoveExecutor:
         Returns:
             CSS selector for that square
         """
-        file = chess.square_file(square) + 1  # 0-7 to 1-8
-        rank = chess.square_rank(square) + 1  # 0-7 to 1-8
-        return f".square-{file}{rank}"
+        return _SQUARE_SELECTORS[square]
 
     async def premove(self, move: chess.Move) -> bool:
         """
@@ -7,7 +7,7 @@ time management, and move delays for human-like play.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GameMode:
     """Configuration for a specific chess game mode."""
 
@@ -115,11 +115,17 @@ GAME_MODES = {
 }
 
 
+# Game modes ordered by time control, built once for UI display
+GAME_MODES_SORTED: tuple[tuple[str, GameMode], ...] = tuple(
+    sorted(GAME_MODES.items(), key=lambda x: x[1].time_seconds)
+)
+
+
 def get_game_mode(mode_id: str) -> GameMode | None:
     """Get a game mode by ID."""
     return GAME_MODES.get(mode_id)
 
 
-def list_game_modes() -> list[tuple[str, GameMode]]:
-    """Get list of all game modes for UI display."""
-    return sorted(GAME_MODES.items(), key=lambda x: x[1].time_seconds)
+def list_game_modes() -> tuple[tuple[str, GameMode], ...]:
+    """Get all game modes for UI display, ordered by time control."""
+    return GAME_MODES_SORTED
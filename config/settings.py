@@ -1,11 +1,11 @@
 """
 Chess Bot Configuration Settings
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Configuration settings for the chess bot."""
 
@@ -19,16 +19,13 @@ class Settings:
     quiescence_depth: int = 8  # Max depth for quiescence search
 
     # Opening book settings
-    opening_book_path: Path = field(
-        default_factory=lambda: Path(__file__).parent / "openings.json"
-    )
+    # Paths are immutable, so the defaults can be shared between instances
+    opening_book_path: Path = Path(__file__).parent / "openings.json"
     opening_book_depth: int = 10  # Use book for first N moves
     use_opening_book: bool = True
 
     # Endgame tablebase settings
-    tablebase_path: Path = field(
-        default_factory=lambda: Path.home() / "chess" / "syzygy"
-    )
+    tablebase_path: Path = Path.home() / "chess" / "syzygy"
     use_tablebase: bool = True
 
     # Browser automation settings
@@ -48,6 +45,7 @@ class Settings:
 
     # Transposition table
     tt_size_mb: int = 256  # Size of transposition table in MB
+    search_threads: int = 1  # Searchers sharing the table (Lazy SMP)
 
     # Logging
     log_level: str = "INFO"
@@ -3,10 +3,14 @@ Endgame Tablebase Integration
 
 Uses Syzygy tablebases for perfect endgame play when few pieces remain.
 """
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import chess
+import numpy as np
 
 # Try to import syzygy support
 try:
@@ -16,6 +20,9 @@ try:
 except ImportError:
     SYZYGY_AVAILABLE = False
 
+# Maximum number of positions remembered per probe cache
+PROBE_CACHE_SIZE = 200_000
+
 
 class EndgameTablebase:
     """
@@ -37,6 +44,17 @@ class EndgameTablebase:
         self.tablebase = None
         self.max_pieces = 6  # Maximum pieces for tablebase lookup
 
+        # LRU caches of probe results keyed by board._transposition_key()
+        # (pieces, side to move, castling, ep; not the move clocks)
+        self._wdl_cache: OrderedDict[tuple, int] = OrderedDict()
+        self._dtz_cache: OrderedDict[tuple, int] = OrderedDict()
+
+        # Probes are blocking file I/O; get_best_move_async runs them on this
+        # single worker so the tablebase is only ever used from one thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="syzygy"
+        )
+
         if not SYZYGY_AVAILABLE:
             print("Warning: chess.syzygy not available. Endgame tablebases disabled.")
             return
@@ -72,7 +90,7 @@ class EndgameTablebase:
             return None
 
         try:
-            return self.tablebase.probe_wdl(board)
+            return self._probe_cached(self._wdl_cache, self.tablebase.probe_wdl, board)
         except KeyError:
             return None
 
@@ -92,7 +110,7 @@ class EndgameTablebase:
             return None
 
         try:
-            return self.tablebase.probe_dtz(board)
+            return self._probe_cached(self._dtz_cache, self.tablebase.probe_dtz, board)
         except KeyError:
             return None
 
@@ -117,15 +135,26 @@ class EndgameTablebase:
         if wdl is None:
             return None
 
-        best_move = None
-        best_dtz = None
+        moves = []
+        values = np.empty((board.legal_moves.count(), 2), dtype=np.int16)
 
         for move in board.legal_moves:
             board.push(move)
 
+            # Mate in one needs no probes and can't be beaten
+            if wdl > 0 and board.is_checkmate():
+                board.pop()
+                return move
+
+            # Both probes share the child's cache key
+            key = board._transposition_key()
             try:
-                child_wdl = self.tablebase.probe_wdl(board)
-                child_dtz = self.tablebase.probe_dtz(board)
+                child_wdl = self._probe_cached(
+                    self._wdl_cache, self.tablebase.probe_wdl, board, key
+                )
+                child_dtz = self._probe_cached(
+                    self._dtz_cache, self.tablebase.probe_dtz, board, key
+                )
             except KeyError:
                 board.pop()
                 continue
@@ -137,29 +166,85 @@ class EndgameTablebase:
             child_wdl = -child_wdl
             child_dtz = -child_dtz if child_dtz is not None else 0
 
-            # Prefer moves based on WDL and DTZ
-            if best_move is None:
-                best_move = move
-                best_dtz = child_dtz
-            elif wdl > 0:  # We're winning - minimize DTZ (fastest win)
-                if child_wdl > 0 and (best_dtz is None or child_dtz < best_dtz):
-                    best_move = move
-                    best_dtz = child_dtz
-            elif wdl == 0:  # Draw - maintain it
-                if child_wdl == 0:
-                    best_move = move
-                    best_dtz = child_dtz
-            else:  # We're losing - maximize DTZ (delay loss)
-                if best_dtz is None or child_dtz > best_dtz:
-                    best_move = move
-                    best_dtz = child_dtz
-
-        return best_move
+            # A winning zeroing move in one ply can't be beaten
+            if wdl == 2 and child_wdl == 2 and child_dtz == 1:
+                return move
+
+            values[len(moves)] = (child_wdl, child_dtz)
+            moves.append(move)
+
+        if not moves:
+            return None
+
+        child_wdls = values[: len(moves), 0]
+        child_dtzs = values[: len(moves), 1]
+
+        # Prefer moves based on WDL and DTZ (first move as the fallback)
+        if wdl > 0:  # We're winning - minimize DTZ (fastest win)
+            winning = np.flatnonzero(child_wdls > 0)
+            idx = winning[np.argmin(child_dtzs[winning])] if winning.size else 0
+        elif wdl == 0:  # Draw - maintain it
+            idx = np.argmax(child_wdls == 0)
+        else:  # We're losing - maximize DTZ (delay loss)
+            idx = np.argmax(child_dtzs)
+
+        return moves[idx]
+
+    async def get_best_move_async(self, board: chess.Board) -> Optional[chess.Move]:
+        """
+        Get the best move without blocking the event loop.
+
+        Runs get_best_move on the tablebase's worker thread.
+
+        Args:
+            board: The chess board (copied, so the caller may keep using it)
+
+        Returns:
+            The best move according to tablebase, or None if not available
+        """
+        if not self.enabled or not self._can_probe(board):
+            return None
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.get_best_move, board.copy(stack=False)
+        )
+
+    def _probe_cached(
+        self,
+        cache: OrderedDict,
+        probe: Callable[[chess.Board], int],
+        board: chess.Board,
+        key: Optional[tuple] = None,
+    ) -> int:
+        """
+        Probe the tablebase through an LRU cache.
+
+        Args:
+            cache: The cache for this kind of probe
+            probe: Tablebase probe function (raises KeyError if not found)
+            board: The chess board to probe
+            key: board._transposition_key(), if already computed
+
+        Returns:
+            The probed value
+        """
+        if key is None:
+            key = board._transposition_key()
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        value = probe(board)
+        cache[key] = value
+        if len(cache) > PROBE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return value
 
     def _can_probe(self, board: chess.Board) -> bool:
         """Check if the position can be probed in the tablebase."""
         # Count pieces
-        piece_count = len(board.piece_map())
+        piece_count = chess.popcount(board.occupied)
 
         # Only probe if few pieces and no castling rights
         if piece_count > self.max_pieces:
@@ -175,6 +260,9 @@ class EndgameTablebase:
 
     def close(self):
         """Close the tablebase."""
+        self._executor.shutdown(wait=True)
+        self._wdl_cache.clear()
+        self._dtz_cache.clear()
         if self.tablebase:
             self.tablebase.close()
             self.tablebase = None
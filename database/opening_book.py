@@ -3,19 +3,27 @@ Opening Book for Chess Engine
 
 Provides pre-computed opening moves to avoid calculation in the early game.
 """
+import bisect
+import itertools
 import json
 import random
 from pathlib import Path
-from typing import Optional
+from typing import Hashable, Optional
 
 import chess
+import chess.polyglot
+
+# Positions with more book moves than this also get an alias table, so
+# weighted sampling is O(1) instead of a bisection
+ALIAS_MIN_MOVES = 4
 
 
 class OpeningBook:
     """
     Opening book that provides known good moves for common positions.
 
-    Uses a dictionary mapping FEN positions to weighted move choices.
+    Uses a dictionary mapping FEN positions to weighted move choices, or
+    a memory-mapped Polyglot (.bin) book for large external books.
     """
 
     def __init__(self, book_path: Optional[Path] = None):
@@ -23,21 +31,42 @@ class OpeningBook:
         Initialize the opening book.
 
         Args:
-            book_path: Path to the opening book JSON file.
-                      If None, uses built-in openings.
+            book_path: Path to the opening book JSON or Polyglot (.bin)
+                      file. If None, uses built-in openings.
         """
         self.book: dict[str, list[dict]] = {}
+        # Polyglot books are memory-mapped and searched on disk instead of
+        # being loaded into self.book
+        self._reader: Optional[chess.polyglot.MemoryMappedReader] = None
+        # Per position, keyed by board._transposition_key(): cumulative
+        # weights, the parallel parsed moves (None if the UCI string is
+        # invalid), the highest-weight move and an optional (prob, alias)
+        # table, for weighted selection (self.book stays the source of truth)
+        self._index: dict[Hashable, tuple] = {}
 
-        if book_path and book_path.exists():
+        if book_path and book_path.exists() and book_path.suffix == ".bin":
+            self._load_polyglot(book_path)
+        elif book_path and book_path.exists():
             self._load_from_file(book_path)
         else:
             self._load_builtin()
 
+        for position_key in self.book:
+            self._index_position(position_key)
+
     def _load_from_file(self, path: Path):
         """Load opening book from JSON file."""
         with open(path) as f:
             self.book = json.load(f)
 
+    def _load_polyglot(self, path: Path):
+        """Open a Polyglot opening book, falling back to the built-in book."""
+        try:
+            self._reader = chess.polyglot.open_reader(path)
+        except Exception as e:
+            print(f"Warning: Could not open Polyglot book {path}: {e}")
+            self._load_builtin()
+
     def _load_builtin(self):
         """Load built-in opening moves."""
         # Common opening positions with weighted moves
@@ -129,6 +158,80 @@ class OpeningBook:
             ],
         }
 
+    def _index_position(self, position_key: str):
+        """Rebuild the weighted-selection index for one book position."""
+        # Book keys are FENs without move counters, possibly without en passant
+        fen_parts = position_key.split()
+        fen_parts += ["-"] * (4 - len(fen_parts))
+        try:
+            key = chess.Board(" ".join(fen_parts) + " 0 1")._transposition_key()
+        except ValueError:
+            return
+
+        moves = self.book[position_key]
+        parsed = [self._parse_move(m["move"]) for m in moves]
+        best = max(range(len(moves)), key=lambda i: moves[i]["weight"], default=None)
+        cum = list(itertools.accumulate(m["weight"] for m in moves))
+        alias = None
+        if len(moves) > ALIAS_MIN_MOVES and cum[-1] > 0:
+            alias = self._build_alias([m["weight"] for m in moves])
+        self._index[key] = (
+            cum,
+            parsed,
+            parsed[best] if best is not None else None,
+            alias,
+        )
+
+    @staticmethod
+    def _build_alias(weights: list[float]) -> tuple[list[float], list[int]]:
+        """
+        Build a Walker alias table for weighted sampling (Vose's method).
+
+        Args:
+            weights: Non-negative weights with a positive total
+
+        Returns:
+            Tuple of (probability, alias) lists: pick a uniform column i,
+            keep it with probability prob[i], otherwise take alias[i]
+        """
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Anything left over is 1.0 up to rounding error
+        return prob, alias
+
+    @staticmethod
+    def _parse_move(move_uci: str) -> Optional[chess.Move]:
+        """Parse a book move, or None if it is not valid UCI."""
+        try:
+            return chess.Move.from_uci(move_uci)
+        except ValueError:
+            return None
+
+    def _lookup(self, board: chess.Board):
+        """Find the index entry for a position, or None if not in the book."""
+        key = board._transposition_key()
+        entry = self._index.get(key)
+
+        # Try without en passant if not found
+        if entry is None and key[-1] is not None:
+            entry = self._index.get(key[:-1] + (None,))
+
+        return entry
+
     def get_move(
         self, board: chess.Board, random_choice: bool = True
     ) -> Optional[chess.Move]:
@@ -143,53 +246,46 @@ class OpeningBook:
         Returns:
             A chess.Move if the position is in the book, None otherwise.
         """
-        # Get position key (FEN without move counters and en passant)
-        fen_parts = board.fen().split()
-        position_key = " ".join(fen_parts[:4])  # position, turn, castling, ep
+        if self._reader is not None:
+            # Entries are filtered to legal moves by the reader
+            try:
+                if random_choice:
+                    return self._reader.weighted_choice(board).move
+                return self._reader.find(board).move
+            except IndexError:
+                pass
 
-        # Try without en passant if not found
-        if position_key not in self.book:
-            position_key = " ".join(fen_parts[:3])  # position, turn, castling
-
-        if position_key not in self.book:
+        entry = self._lookup(board)
+        if entry is None:
             return None
 
-        moves = self.book[position_key]
+        cum, moves, best, alias = entry
 
-        if random_choice:
-            # Weighted random choice
-            total_weight = sum(m["weight"] for m in moves)
-            r = random.uniform(0, total_weight)
-            cumulative = 0
-            for m in moves:
-                cumulative += m["weight"]
-                if r <= cumulative:
-                    move_uci = m["move"]
-                    break
-            else:
-                move_uci = moves[0]["move"]
+        if random_choice and alias is not None:
+            # Weighted random choice in O(1) from the alias table
+            prob, alias_idx = alias
+            i = int(random.random() * len(moves))
+            move = moves[i] if random.random() < prob[i] else moves[alias_idx[i]]
+        elif random_choice:
+            # Weighted random choice: first move whose cumulative weight
+            # reaches r
+            r = random.uniform(0, cum[-1])
+            move = moves[bisect.bisect_left(cum, r)]
         else:
             # Choose highest weight
-            move_uci = max(moves, key=lambda x: x["weight"])["move"]
+            move = best
 
-        # Parse and validate the move
-        try:
-            move = chess.Move.from_uci(move_uci)
-            if move in board.legal_moves:
-                return move
-        except ValueError:
-            pass
+        # Validate the move (already parsed when the book was indexed)
+        if move is not None and board.is_legal(move):
+            return move
 
         return None
 
     def is_in_book(self, board: chess.Board) -> bool:
         """Check if the current position is in the opening book."""
-        fen_parts = board.fen().split()
-        position_key = " ".join(fen_parts[:4])
-        if position_key in self.book:
+        if self._reader is not None and self._reader.get(board) is not None:
             return True
-        position_key = " ".join(fen_parts[:3])
-        return position_key in self.book
+        return self._lookup(board) is not None
 
     def add_move(
         self, board: chess.Board, move: chess.Move, weight: int = 50
@@ -213,11 +309,19 @@ class OpeningBook:
         for m in self.book[position_key]:
             if m["move"] == move_uci:
                 m["weight"] = weight
-                return
+                break
+        else:
+            self.book[position_key].append({"move": move_uci, "weight": weight})
 
-        self.book[position_key].append({"move": move_uci, "weight": weight})
+        self._index_position(position_key)
 
     def save(self, path: Path):
         """Save the opening book to a JSON file."""
         with open(path, "w") as f:
             json.dump(self.book, f, indent=2)
+
+    def close(self):
+        """Close the Polyglot book, if one is open."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -4,6 +4,8 @@ Board Evaluation Function for Chess Engine
 Evaluates board positions in centipawns (1 pawn = 100 centipawns).
 Positive scores favor White, negative scores favor Black.
 """
+from typing import Optional
+
 import chess
 import numpy as np
 
@@ -20,8 +22,51 @@ PIECE_VALUES = {
 # Mate score (high value to ensure checkmate is prioritized)
 MATE_SCORE = 100000
 
+# Largest swing expected from the mobility, pawn structure and king safety
+# terms; lazy evaluation stops after material and piece-square tables when
+# even this much can't bring the score back inside the search window
+LAZY_MARGIN = 200
+
+
+def _passed_pawn_mask(square: chess.Square, color: chess.Color) -> chess.Bitboard:
+    """Squares on the pawn's and adjacent files that are ahead of it."""
+    file = chess.square_file(square)
+    rank = chess.square_rank(square)
+    ranks = range(rank + 1, 8) if color == chess.WHITE else range(rank)
+    mask = chess.BB_EMPTY
+    for f in range(max(file - 1, 0), min(file + 1, 7) + 1):
+        for r in ranks:
+            mask |= chess.BB_SQUARES[chess.square(f, r)]
+    return mask
+
+
+# Per color and square: where an enemy pawn stops a pawn from being passed
+PASSED_PAWN_MASKS = {
+    color: [_passed_pawn_mask(square, color) for square in chess.SQUARES]
+    for color in chess.COLORS
+}
+
+
+def _king_shield_mask(square: chess.Square, color: chess.Color) -> chess.Bitboard:
+    """Squares on the king's and adjacent files one rank in front of it."""
+    file = chess.square_file(square)
+    rank = chess.square_rank(square) + (1 if color == chess.WHITE else -1)
+    mask = chess.BB_EMPTY
+    if 0 <= rank <= 7:
+        for f in range(max(file - 1, 0), min(file + 1, 7) + 1):
+            mask |= chess.BB_SQUARES[chess.square(f, rank)]
+    return mask
+
+
+# Per color and king square: where own pawns count towards the pawn shield
+KING_SHIELD_MASKS = {
+    color: [_king_shield_mask(square, color) for square in chess.SQUARES]
+    for color in chess.COLORS
+}
+
 # Piece-Square Tables (from White's perspective, flip for Black)
-# Values represent positional bonuses/penalties for each square
+# Values represent positional bonuses/penalties for each square (int16:
+# every entry is within +/-50, so each table is 128 bytes)
 
 PAWN_TABLE = np.array([
     [  0,   0,   0,   0,   0,   0,   0,   0],
@@ -32,7 +77,7 @@ PAWN_TABLE = np.array([
     [  5,  -5, -10,   0,   0, -10,  -5,   5],
     [  5,  10,  10, -20, -20,  10,  10,   5],
     [  0,   0,   0,   0,   0,   0,   0,   0],
-])
+], dtype=np.int16)
 
 KNIGHT_TABLE = np.array([
     [-50, -40, -30, -30, -30, -30, -40, -50],
@@ -43,7 +88,7 @@ KNIGHT_TABLE = np.array([
     [-30,   5,  10,  15,  15,  10,   5, -30],
     [-40, -20,   0,   5,   5,   0, -20, -40],
     [-50, -40, -30, -30, -30, -30, -40, -50],
-])
+], dtype=np.int16)
 
 BISHOP_TABLE = np.array([
     [-20, -10, -10, -10, -10, -10, -10, -20],
@@ -54,7 +99,7 @@ BISHOP_TABLE = np.array([
     [-10,  10,  10,  10,  10,  10,  10, -10],
     [-10,   5,   0,   0,   0,   0,   5, -10],
     [-20, -10, -10, -10, -10, -10, -10, -20],
-])
+], dtype=np.int16)
 
 ROOK_TABLE = np.array([
     [  0,   0,   0,   0,   0,   0,   0,   0],
@@ -65,7 +110,7 @@ ROOK_TABLE = np.array([
     [ -5,   0,   0,   0,   0,   0,   0,  -5],
     [ -5,   0,   0,   0,   0,   0,   0,  -5],
     [  0,   0,   0,   5,   5,   0,   0,   0],
-])
+], dtype=np.int16)
 
 QUEEN_TABLE = np.array([
     [-20, -10, -10,  -5,  -5, -10, -10, -20],
@@ -76,7 +121,7 @@ QUEEN_TABLE = np.array([
     [-10,   5,   5,   5,   5,   5,   0, -10],
     [-10,   0,   5,   0,   0,   0,   0, -10],
     [-20, -10, -10,  -5,  -5, -10, -10, -20],
-])
+], dtype=np.int16)
 
 KING_MIDDLEGAME_TABLE = np.array([
     [-30, -40, -40, -50, -50, -40, -40, -30],
@@ -87,7 +132,7 @@ KING_MIDDLEGAME_TABLE = np.array([
     [-10, -20, -20, -20, -20, -20, -20, -10],
     [ 20,  20,   0,   0,   0,   0,  20,  20],
     [ 20,  30,  10,   0,   0,  10,  30,  20],
-])
+], dtype=np.int16)
 
 KING_ENDGAME_TABLE = np.array([
     [-50, -40, -30, -20, -20, -30, -40, -50],
@@ -98,7 +143,7 @@ KING_ENDGAME_TABLE = np.array([
     [-30, -10,  20,  30,  30,  20, -10, -30],
     [-30, -30,   0,   0,   0,   0, -30, -30],
     [-50, -30, -30, -30, -30, -30, -30, -50],
-])
+], dtype=np.int16)
 
 
 class Evaluator:
@@ -118,35 +163,62 @@ class Evaluator:
         self.king_safety_weight = king_safety_weight
         self.pawn_structure_weight = pawn_structure_weight
 
-        # Precompute flipped tables for Black
-        self.piece_tables = {
-            chess.WHITE: {
-                chess.PAWN: PAWN_TABLE,
-                chess.KNIGHT: KNIGHT_TABLE,
-                chess.BISHOP: BISHOP_TABLE,
-                chess.ROOK: ROOK_TABLE,
-                chess.QUEEN: QUEEN_TABLE,
-                chess.KING: KING_MIDDLEGAME_TABLE,
-            },
-            chess.BLACK: {
-                chess.PAWN: np.flip(PAWN_TABLE, axis=0),
-                chess.KNIGHT: np.flip(KNIGHT_TABLE, axis=0),
-                chess.BISHOP: np.flip(BISHOP_TABLE, axis=0),
-                chess.ROOK: np.flip(ROOK_TABLE, axis=0),
-                chess.QUEEN: np.flip(QUEEN_TABLE, axis=0),
-                chess.KING: np.flip(KING_MIDDLEGAME_TABLE, axis=0),
-            },
-        }
-
-        self.king_endgame_tables = {
-            chess.WHITE: KING_ENDGAME_TABLE,
-            chess.BLACK: np.flip(KING_ENDGAME_TABLE, axis=0),
-        }
-
-    def evaluate(self, board: chess.Board) -> int:
+        # White's tables indexed by piece type (slot 0 is unused)
+        white_tables = (
+            None,
+            PAWN_TABLE,
+            KNIGHT_TABLE,
+            BISHOP_TABLE,
+            ROOK_TABLE,
+            QUEEN_TABLE,
+            KING_MIDDLEGAME_TABLE,
+        )
+
+        # White's tables flattened into square-index order (a1 = 0), as
+        # plain lists so a single square lookup is one list index. Black
+        # pieces are looked up on the vertically mirrored bitboard.
+        self.pst_flat = (None,) + tuple(
+            self._flatten_table(table) for table in white_tables[1:]
+        )
+        self.king_endgame_flat = self._flatten_table(KING_ENDGAME_TABLE)
+
+        # (piece value, table) per piece type in chess.PIECE_TYPES order, for
+        # the middlegame and with the endgame king table
+        self._pst_entries = tuple(
+            (PIECE_VALUES[piece_type], self.pst_flat[piece_type])
+            for piece_type in chess.PIECE_TYPES
+        )
+        self._pst_entries_endgame = self._pst_entries[:-1] + (
+            (PIECE_VALUES[chess.KING], self.king_endgame_flat),
+        )
+
+    @staticmethod
+    def _flatten_table(table: np.ndarray) -> list[int]:
+        """Reorder an 8x8 table (rank 8 first) into a 64-entry list by square."""
+        return np.flipud(table).reshape(64).tolist()
+
+    def evaluate(
+        self,
+        board: chess.Board,
+        alpha: Optional[float] = None,
+        beta: Optional[float] = None,
+        check_draws: bool = True,
+    ) -> int:
         """
         Evaluate the board position.
 
+        If the caller's search window is given, the cheaper terms (material
+        and piece-square tables) are returned on their own when they are
+        more than LAZY_MARGIN outside it.
+
+        Args:
+            board: The board to evaluate
+            alpha: Lower bound of the search window (side to move)
+            beta: Upper bound of the search window (side to move)
+            check_draws: Whether to test for claimable draws (repetition,
+                fifty-move rule); search passes False as it checks these
+                itself before evaluating
+
         Returns:
             Score in centipawns from the perspective of the side to move.
             Positive = good for side to move, negative = bad.
@@ -158,190 +230,207 @@ class Evaluator:
         if board.is_stalemate() or board.is_insufficient_material():
             return 0
 
-        if board.can_claim_draw():
+        if check_draws and board.can_claim_draw():
             return 0
 
+        is_endgame = self._is_endgame(board)
+        material, positional = self._material_and_position(board, is_endgame)
+
         # Calculate evaluation components
         score = 0
-        score += self.material_weight * self._evaluate_material(board)
-        score += self.position_weight * self._evaluate_piece_positions(board)
+        score += self.material_weight * material
+        score += self.position_weight * positional
+
+        # Lazy evaluation: skip the costly terms if they can't matter
+        if alpha is not None and beta is not None:
+            lazy = score if board.turn == chess.WHITE else -score
+            if lazy + LAZY_MARGIN <= alpha or lazy - LAZY_MARGIN >= beta:
+                return lazy
+
         score += self.mobility_weight * self._evaluate_mobility(board)
-        score += self.pawn_structure_weight * self._evaluate_pawn_structure(board)
+
+        pawn_structure, king_safety = self._evaluate_pawns_and_king_safety(
+            board, is_endgame
+        )
+        score += self.pawn_structure_weight * pawn_structure
 
         # King safety is more important in middlegame
-        if not self._is_endgame(board):
-            score += self.king_safety_weight * self._evaluate_king_safety(board)
+        if not is_endgame:
+            score += self.king_safety_weight * king_safety
 
         # Return score from perspective of side to move
         return score if board.turn == chess.WHITE else -score
 
-    def _evaluate_material(self, board: chess.Board) -> int:
-        """Count material difference."""
-        score = 0
-        for piece_type in PIECE_VALUES:
-            white_pieces = len(board.pieces(piece_type, chess.WHITE))
-            black_pieces = len(board.pieces(piece_type, chess.BLACK))
-            score += PIECE_VALUES[piece_type] * (white_pieces - black_pieces)
+    def _material_and_position(
+        self, board: chess.Board, is_endgame: bool
+    ) -> tuple[int, int]:
+        """
+        Count material and score piece-square tables in one pass.
 
-        # Bishop pair bonus
-        if len(board.pieces(chess.BISHOP, chess.WHITE)) >= 2:
-            score += 50
-        if len(board.pieces(chess.BISHOP, chess.BLACK)) >= 2:
-            score -= 50
+        Each piece bitboard is read once and used for both the material
+        count and the piece-square lookups.
 
-        return score
+        Args:
+            board: The board to evaluate
+            is_endgame: Whether to use the endgame king table
 
-    def _evaluate_piece_positions(self, board: chess.Board) -> int:
-        """Evaluate piece positions using piece-square tables."""
-        score = 0
-        is_endgame = self._is_endgame(board)
-
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece is None:
-                continue
+        Returns:
+            Tuple of (material difference, positional score), White positive
+        """
+        white_occ = board.occupied_co[chess.WHITE]
+        black_occ = board.occupied_co[chess.BLACK]
+        popcount = chess.popcount
+        scan_forward = chess.scan_forward
+
+        material = 0
+        positional = 0
+
+        # Use endgame king table if in endgame
+        entries = self._pst_entries_endgame if is_endgame else self._pst_entries
+        bitboards = (
+            board.pawns,
+            board.knights,
+            board.bishops,
+            board.rooks,
+            board.queens,
+            board.kings,
+        )
+
+        for bitboard, (value, table) in zip(bitboards, entries):
+            white = bitboard & white_occ
+            # Mirroring Black's bitboard once replaces a flipped table
+            black = chess.flip_vertical(bitboard & black_occ)
+            material += value * (popcount(white) - popcount(black))
+
+            # Walk each piece bitboard instead of probing all 64 squares
+            for square in scan_forward(white):
+                positional += table[square]
+            for square in scan_forward(black):
+                positional -= table[square]
 
-            # Get row and column (0-7)
-            row = 7 - (square // 8)  # Flip row for correct orientation
-            col = square % 8
+        # Bishop pair bonus
+        if popcount(board.bishops & white_occ) >= 2:
+            material += 50
+        if popcount(board.bishops & black_occ) >= 2:
+            material -= 50
 
-            # Use endgame king table if in endgame
-            if piece.piece_type == chess.KING and is_endgame:
-                table = self.king_endgame_tables[piece.color]
-            else:
-                table = self.piece_tables[piece.color][piece.piece_type]
+        return material, positional
 
-            value = int(table[row, col])
+    def _evaluate_mobility(self, board: chess.Board) -> int:
+        """
+        Evaluate piece mobility.
 
-            if piece.color == chess.WHITE:
-                score += value
+        Approximates each side's move count by the squares its pieces
+        (excluding pawns) attack that aren't occupied by its own pieces.
+        This avoids generating legal moves for both sides behind a null
+        move, at the cost of ignoring pins, check evasions and pawn pushes.
+        """
+        white_moves = self._attack_mobility(board, chess.WHITE)
+        black_moves = self._attack_mobility(board, chess.BLACK)
+
+        # A side in check has few real moves; as before, don't credit it
+        # with any while the side to move is giving check
+        enemy_king = board.king(not board.turn)
+        if enemy_king is not None and board.is_attacked_by(board.turn, enemy_king):
+            if board.turn == chess.WHITE:
+                black_moves = 0
             else:
-                score -= value
-
-        return score
+                white_moves = 0
 
-    def _evaluate_mobility(self, board: chess.Board) -> int:
-        """Evaluate piece mobility (number of legal moves)."""
-        # Count moves for current side
-        current_moves = board.legal_moves.count()
+        mobility = white_moves - black_moves
 
-        # Switch sides and count opponent moves
-        board.push(chess.Move.null())
-        opponent_moves = board.legal_moves.count() if not board.is_check() else 0
-        board.pop()
+        return mobility * 10  # Scale factor
 
-        mobility = current_moves - opponent_moves
+    def _attack_mobility(self, board: chess.Board, color: chess.Color) -> int:
+        """Count squares attacked by non-pawn pieces, excluding own pieces."""
+        own = board.occupied_co[color]
+        count = 0
+        for square in chess.scan_forward(own & ~board.pawns):
+            count += chess.popcount(board.attacks_mask(square) & ~own)
+        return count
+
+    def _evaluate_pawns_and_king_safety(
+        self, board: chess.Board, is_endgame: bool
+    ) -> tuple[int, int]:
+        """
+        Evaluate pawn structure and king safety in one pass over the pawns.
 
-        # Adjust perspective
-        if board.turn == chess.BLACK:
-            mobility = -mobility
+        Pawn structure covers doubled, isolated and passed pawns; king
+        safety covers the pawn shield and open files near the king. Both
+        share each side's pawn bitboard and file bitmask.
 
-        return mobility * 10  # Scale factor
+        Args:
+            board: The board to evaluate
+            is_endgame: Whether to skip king safety (scored as 0)
 
-    def _evaluate_pawn_structure(self, board: chess.Board) -> int:
-        """Evaluate pawn structure (doubled, isolated, passed pawns)."""
-        score = 0
+        Returns:
+            Tuple of (pawn structure, king safety), White positive
+        """
+        pawn_score = 0
+        king_score = 0
 
         for color in [chess.WHITE, chess.BLACK]:
-            pawns = board.pieces(chess.PAWN, color)
-            pawn_files = [chess.square_file(sq) for sq in pawns]
+            pawns = board.pieces_mask(chess.PAWN, color)
             multiplier = 1 if color == chess.WHITE else -1
 
-            # Doubled pawns penalty
-            for file in range(8):
-                count = pawn_files.count(file)
-                if count > 1:
-                    score -= 20 * (count - 1) * multiplier
-
-            # Isolated pawns penalty
-            for pawn_sq in pawns:
-                file = chess.square_file(pawn_sq)
-                has_neighbor = False
-                for adj_file in [file - 1, file + 1]:
-                    if 0 <= adj_file <= 7 and adj_file in pawn_files:
-                        has_neighbor = True
-                        break
-                if not has_neighbor:
-                    score -= 15 * multiplier
+            # Pawns per file, and a bit per file that has any (bit 0 = a-file)
+            file_counts = [chess.popcount(pawns & bb) for bb in chess.BB_FILES]
+            occupied_files = 0
+            for file, count in enumerate(file_counts):
+                if count:
+                    occupied_files |= 1 << file
+
+                    # Doubled pawns penalty
+                    if count > 1:
+                        pawn_score -= 20 * (count - 1) * multiplier
+
+            # Isolated pawns penalty: files with no pawns on either neighbour
+            isolated_files = occupied_files & ~(
+                (occupied_files << 1) | (occupied_files >> 1)
+            )
+            for file in chess.scan_forward(isolated_files):
+                pawn_score -= 15 * file_counts[file] * multiplier
 
             # Passed pawns bonus
-            for pawn_sq in pawns:
+            for pawn_sq in chess.scan_forward(pawns):
                 if self._is_passed_pawn(board, pawn_sq, color):
                     rank = chess.square_rank(pawn_sq)
                     if color == chess.WHITE:
                         bonus = 20 + (rank - 1) * 10  # More advanced = more valuable
                     else:
                         bonus = 20 + (6 - rank) * 10
-                    score += bonus * multiplier
-
-        return score
+                    pawn_score += bonus * multiplier
 
-    def _is_passed_pawn(
-        self, board: chess.Board, pawn_square: int, color: bool
-    ) -> bool:
-        """Check if a pawn is passed (no enemy pawns blocking or attacking)."""
-        file = chess.square_file(pawn_square)
-        rank = chess.square_rank(pawn_square)
-        enemy_pawns = board.pieces(chess.PAWN, not color)
-
-        for enemy_sq in enemy_pawns:
-            enemy_file = chess.square_file(enemy_sq)
-            enemy_rank = chess.square_rank(enemy_sq)
-
-            # Check if enemy pawn is on same or adjacent file
-            if abs(enemy_file - file) <= 1:
-                # Check if enemy pawn is ahead
-                if color == chess.WHITE and enemy_rank > rank:
-                    return False
-                if color == chess.BLACK and enemy_rank < rank:
-                    return False
-
-        return True
-
-    def _evaluate_king_safety(self, board: chess.Board) -> int:
-        """Evaluate king safety (pawn shield, open files near king)."""
-        score = 0
+            if is_endgame:
+                continue
 
-        for color in [chess.WHITE, chess.BLACK]:
             king_sq = board.king(color)
             if king_sq is None:
                 continue
 
-            king_file = chess.square_file(king_sq)
-            king_rank = chess.square_rank(king_sq)
-            multiplier = 1 if color == chess.WHITE else -1
-
             # Pawn shield evaluation
-            shield_rank = king_rank + (1 if color == chess.WHITE else -1)
-            if 0 <= shield_rank <= 7:
-                for f in [king_file - 1, king_file, king_file + 1]:
-                    if 0 <= f <= 7:
-                        shield_sq = chess.square(f, shield_rank)
-                        piece = board.piece_at(shield_sq)
-                        if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                            score += 10 * multiplier
+            shield = pawns & KING_SHIELD_MASKS[color][king_sq]
+            king_score += 10 * chess.popcount(shield) * multiplier
 
             # Penalty for king on open file
-            own_pawns = board.pieces(chess.PAWN, color)
-            file_has_pawn = any(chess.square_file(sq) == king_file for sq in own_pawns)
-            if not file_has_pawn:
-                score -= 20 * multiplier
+            if not (occupied_files >> chess.square_file(king_sq)) & 1:
+                king_score -= 20 * multiplier
 
-        return score
+        return pawn_score, king_score
+
+    def _is_passed_pawn(
+        self, board: chess.Board, pawn_square: int, color: bool
+    ) -> bool:
+        """Check if a pawn is passed (no enemy pawns blocking or attacking)."""
+        enemy_pawns = board.pieces_mask(chess.PAWN, not color)
+        return not enemy_pawns & PASSED_PAWN_MASKS[color][pawn_square]
 
     def _is_endgame(self, board: chess.Board) -> bool:
         """Determine if position is an endgame."""
         # Simple heuristic: endgame if queens are off or few pieces remain
-        white_queens = len(board.pieces(chess.QUEEN, chess.WHITE))
-        black_queens = len(board.pieces(chess.QUEEN, chess.BLACK))
-
-        if white_queens == 0 and black_queens == 0:
+        if not board.queens:
             return True
 
         # Count non-pawn, non-king pieces
-        piece_count = 0
-        for piece_type in [chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]:
-            piece_count += len(board.pieces(piece_type, chess.WHITE))
-            piece_count += len(board.pieces(piece_type, chess.BLACK))
-
-        return piece_count <= 6
+        pieces = board.knights | board.bishops | board.rooks | board.queens
+        return chess.popcount(pieces) <= 6
@@ -3,13 +3,52 @@ Minimax Chess Engine with Alpha-Beta Pruning
 
 Implements the core search algorithm for finding the best chess moves.
 """
+import concurrent.futures
+import math
+import multiprocessing
 import time
-from typing import Optional
+from multiprocessing import shared_memory
+from operator import itemgetter
+from typing import Iterator, Optional
 
 import chess
 
-from .evaluator import MATE_SCORE, Evaluator
-from .transposition import NodeType, TranspositionTable
+from .evaluator import MATE_SCORE, PIECE_VALUES, Evaluator
+from .transposition import NodeType, TranspositionTable, ZobristBoard
+
+# MVV-LVA capture scores indexed [victim][attacker] piece type: most valuable
+# victim first, then least valuable attacker. Row 0 (no piece on the target
+# square, as for en passant) scores 0.
+MVV_LVA = tuple(
+    tuple(victim * 100 - attacker if victim else 0 for attacker in range(7))
+    for victim in range(7)
+)
+
+# Material won by a capture, indexed by the piece type on the target square
+# (0 is en passant, which takes a pawn)
+CAPTURE_VALUES = (PIECE_VALUES[chess.PAWN],) + tuple(
+    PIECE_VALUES[piece_type] for piece_type in chess.PIECE_TYPES
+)
+
+# Delta pruning: quiescence skips a capture when even winning the piece plus
+# this margin would leave the score at or below alpha
+DELTA_MARGIN = 200
+
+# Half-width of the first aspiration window around the previous iteration's
+# score; it doubles on each fail and becomes the full window past the max
+ASPIRATION_WINDOW = 50
+ASPIRATION_MAX = 800
+
+# Late move reduction in plies, indexed [depth][moves searched so far]
+LMR_REDUCTIONS = tuple(
+    tuple(
+        int(0.75 + math.log(depth) * math.log(searched) / 2.25)
+        if depth and searched
+        else 0
+        for searched in range(64)
+    )
+    for depth in range(64)
+)
 
 
 class ChessEngine:
@@ -22,6 +61,8 @@ class ChessEngine:
     - Transposition table for caching
     - Move ordering for better pruning
     - Quiescence search for tactical stability
+    - Optional Lazy SMP: helper processes search the same position and
+      share the transposition table
     """
 
     def __init__(
@@ -31,6 +72,7 @@ class ChessEngine:
         use_quiescence: bool = True,
         quiescence_depth: int = 8,
         tt_size_mb: int = 256,
+        threads: int = 1,
     ):
         """
         Initialize the chess engine.
@@ -41,27 +83,67 @@ class ChessEngine:
             use_quiescence: Whether to use quiescence search
             quiescence_depth: Maximum depth for quiescence search
             tt_size_mb: Transposition table size in MB
+            threads: Number of searchers; more than 1 starts threads - 1
+                helper processes sharing the transposition table
         """
         self.max_depth = max_depth
         self.time_limit = time_limit
         self.use_quiescence = use_quiescence
         self.quiescence_depth = quiescence_depth
+        self.threads = max(1, threads)
 
         self.evaluator = Evaluator()
-        self.tt = TranspositionTable(tt_size_mb)
+
+        # Lazy SMP helpers (only with threads > 1)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._stop = None
+        self._helper_futures: list[concurrent.futures.Future] = []
+
+        if self.threads > 1:
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=TranspositionTable.nbytes(tt_size_mb)
+            )
+            self.tt = TranspositionTable(tt_size_mb, buffer=self._shm.buf)
+            # Spawn rather than fork: the bot process runs browser threads
+            context = multiprocessing.get_context("spawn")
+            self._stop = context.Event()
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.threads - 1,
+                mp_context=context,
+                initializer=_init_helper,
+                initargs=(
+                    self._shm.name,
+                    dict(
+                        max_depth=max_depth,
+                        time_limit=time_limit,
+                        use_quiescence=use_quiescence,
+                        quiescence_depth=quiescence_depth,
+                        tt_size_mb=tt_size_mb,
+                    ),
+                    self._stop,
+                ),
+            )
+        else:
+            self.tt = TranspositionTable(tt_size_mb)
 
         # Search statistics
         self.nodes_searched = 0
         self.tt_hits = 0
         self.start_time = 0.0
 
+        # Search deadline (time.monotonic_ns()) and whether it has passed;
+        # once set, the flag stays set for the rest of the search
+        self.deadline_ns = 0
+        self._timed_out = False
+
         # Killer moves (moves that caused beta cutoffs)
         self.killer_moves: list[list[Optional[chess.Move]]] = [
             [None, None] for _ in range(64)
         ]
 
-        # History heuristic (tracks move success)
-        self.history: dict[tuple[int, int], int] = {}
+        # History heuristic (tracks move success), indexed [from][to]
+        self.history: list[list[int]] = [[0] * 64 for _ in range(64)]
 
     def find_best_move(self, board: chess.Board) -> Optional[chess.Move]:
         """
@@ -79,20 +161,90 @@ class ChessEngine:
         if not list(board.legal_moves):
             return None
 
+        # Search on a copy that keeps its Zobrist hash up to date, so the
+        # transposition table doesn't rehash the whole board at every node
+        board = ZobristBoard.from_board(board)
+
+        if self._pool is None:
+            return self._iterative_deepening(board)
+
+        # The main search and its helpers share one table age, set here
+        self.tt.new_search()
+        self._start_helpers(board)
+        try:
+            return self._iterative_deepening(board, new_search=False)
+        finally:
+            # Helpers notice within one time check; they are waited for
+            # before the next search
+            self._stop.set()
+
+    def _start_helpers(self, board: ZobristBoard):
+        """Start the helper processes searching the same position."""
+        self._wait_for_helpers()
+        self._stop.clear()
+
+        fen = board.root().fen()
+        moves = [move.uci() for move in board.move_stack]
+        self._helper_futures = [
+            # Every other helper starts one ply deeper, so the searchers
+            # spread over different depths of the shared table
+            self._pool.submit(
+                _helper_search, fen, moves, 1 + i % 2, self.time_limit, self.tt.age
+            )
+            for i in range(1, self.threads)
+        ]
+
+    def _wait_for_helpers(self):
+        """Wait for the previous search's helpers to stop."""
+        if self._helper_futures:
+            concurrent.futures.wait(self._helper_futures)
+            self._helper_futures = []
+
+    def _iterative_deepening(
+        self,
+        board: ZobristBoard,
+        start_depth: int = 1,
+        report: bool = True,
+        new_search: bool = True,
+    ) -> Optional[chess.Move]:
+        """
+        Search progressively deeper until max_depth or the time limit.
+
+        Args:
+            board: The position to search
+            start_depth: First depth to search
+            report: Whether to print a line per completed depth
+            new_search: Whether to advance the table age; False when the
+                caller has already set it for a shared-table search
+
+        Returns:
+            The best move found, or None if no depth completed
+        """
         self.nodes_searched = 0
         self.tt_hits = 0
-        self.start_time = time.time()
-        self.tt.new_search()
+        self.start_time = time.monotonic()
+        self.deadline_ns = time.monotonic_ns() + int(self.time_limit * 1e9)
+        self._timed_out = False
+        if new_search:
+            self.tt.new_search()
 
         best_move = None
         best_score = -MATE_SCORE
 
         # Iterative deepening
-        for depth in range(1, self.max_depth + 1):
+        for depth in range(start_depth, self.max_depth + 1):
             if self._time_up():
                 break
 
-            score, move = self._search_root(board, depth)
+            # Narrow the window around the previous score once there is one
+            if (
+                depth > 1
+                and best_move is not None
+                and abs(best_score) < MATE_SCORE - 100
+            ):
+                score, move = self._aspiration_search(board, depth, best_score)
+            else:
+                score, move = self._search_root(board, depth)
 
             # Always save a completed depth result
             if move is not None:
@@ -100,17 +252,18 @@ class ChessEngine:
                 best_score = score
 
                 # Print search info
-                elapsed = time.time() - self.start_time
-                nps = self.nodes_searched / elapsed if elapsed > 0 else 0
-                pv = self.tt.get_pv_line(board)
-                pv_str = " ".join(m.uci() for m in pv)
-
-                print(
-                    f"depth {depth:2d}  score {int(score):+6d}  "
-                    f"nodes {self.nodes_searched:8d}  "
-                    f"nps {nps:8.0f}  "
-                    f"pv {pv_str}"
-                )
+                if report:
+                    elapsed = time.monotonic() - self.start_time
+                    nps = self.nodes_searched / elapsed if elapsed > 0 else 0
+                    pv = self.tt.get_pv_line(board)
+                    pv_str = " ".join(m.uci() for m in pv)
+
+                    print(
+                        f"depth {depth:2d}  score {int(score):+6d}  "
+                        f"nodes {self.nodes_searched:8d}  "
+                        f"nps {nps:8.0f}  "
+                        f"pv {pv_str}"
+                    )
 
             # Stop early if we found a forced mate
             if abs(score) > MATE_SCORE - 100:
@@ -118,8 +271,52 @@ class ChessEngine:
 
         return best_move
 
+    def _aspiration_search(
+        self, board: chess.Board, depth: int, prev_score: int
+    ) -> tuple[int, Optional[chess.Move]]:
+        """
+        Search the root in a narrow window around the previous score.
+
+        The window is widened on the side that failed, doubling each time,
+        until the score falls inside it.
+
+        Args:
+            board: The current board position
+            depth: Search depth
+            prev_score: Score of the previous iteration
+
+        Returns:
+            Tuple of (best score, best move); the move is None if time ran
+            out while the score was failing low
+        """
+        delta = ASPIRATION_WINDOW
+        alpha = prev_score - delta
+        beta = prev_score + delta
+
+        while True:
+            score, move = self._search_root(board, depth, alpha, beta)
+
+            if alpha < score < beta or (alpha <= -MATE_SCORE and beta >= MATE_SCORE):
+                return score, move
+            if self._time_up():
+                # A fail-high move is still at least as good as the window;
+                # a fail-low one is only an upper bound
+                return score, (move if score >= beta else None)
+
+            delta *= 2
+            if delta > ASPIRATION_MAX:
+                alpha, beta = -MATE_SCORE, MATE_SCORE
+            elif score <= alpha:
+                alpha = max(prev_score - delta, -MATE_SCORE)
+            else:
+                beta = min(prev_score + delta, MATE_SCORE)
+
     def _search_root(
-        self, board: chess.Board, depth: int
+        self,
+        board: chess.Board,
+        depth: int,
+        alpha: int = -MATE_SCORE,
+        beta: int = MATE_SCORE,
     ) -> tuple[int, Optional[chess.Move]]:
         """
         Search at the root node.
@@ -127,24 +324,31 @@ class ChessEngine:
         Args:
             board: The current board position
             depth: Search depth
+            alpha: Lower bound of the search window
+            beta: Upper bound of the search window
 
         Returns:
             Tuple of (best score, best move)
         """
-        alpha = -MATE_SCORE
-        beta = MATE_SCORE
         best_move = None
         best_score = -MATE_SCORE
 
         # Order moves for better pruning
-        moves = self._order_moves(board, depth)
+        moves = self._ordered_moves(board, depth)
 
-        for move in moves:
+        for i, move in enumerate(moves):
             if self._time_up():
                 break
 
             board.push(move)
-            score = -self._alpha_beta(board, depth - 1, -beta, -alpha)
+            if i == 0:
+                score = -self._alpha_beta(board, depth - 1, -beta, -alpha)
+            else:
+                # Principal variation search: prove the move is no better
+                # with a null window, re-search only if it is
+                score = -self._alpha_beta(board, depth - 1, -alpha - 1, -alpha)
+                if alpha < score < beta:
+                    score = -self._alpha_beta(board, depth - 1, -beta, -alpha)
             board.pop()
 
             if score > best_score:
@@ -154,6 +358,10 @@ class ChessEngine:
                 if score > alpha:
                     alpha = score
 
+            # Failed high: the caller widens the window and searches again
+            if alpha >= beta:
+                break
+
         return best_score, best_move
 
     def _alpha_beta(
@@ -181,11 +389,27 @@ class ChessEngine:
         if board.is_checkmate():
             return -MATE_SCORE + board.ply()  # Prefer shorter mates
 
-        if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_draw():
+        # Draws; inside the search a single repetition is scored as a draw,
+        # since the side that repeated can repeat again
+        if (
+            board.halfmove_clock >= 100
+            or board.is_hash_repetition(2)
+            or board.is_insufficient_material()
+            or board.is_stalemate()
+        ):
             return 0
 
+        # Mate distance pruning: no line from here can be mated sooner than
+        # this ply or mate sooner than the next one
+        ply = board.ply()
+        alpha = max(alpha, -MATE_SCORE + ply)
+        beta = min(beta, MATE_SCORE - ply - 1)
+        if alpha >= beta:
+            return alpha
+
         # Transposition table lookup
-        tt_entry = self.tt.probe(board)
+        hash_key = self.tt.hash_position(board)
+        tt_entry = self.tt.probe(board, hash_key)
         if tt_entry is not None and tt_entry.depth >= depth:
             self.tt_hits += 1
             if tt_entry.node_type == NodeType.EXACT:
@@ -202,12 +426,22 @@ class ChessEngine:
         if depth <= 0:
             if self.use_quiescence:
                 return self._quiescence(board, alpha, beta, self.quiescence_depth)
-            return self.evaluator.evaluate(board)
-
-        # Null move pruning (skip if in check, endgame, or shallow depth)
-        if depth >= 3 and not board.is_check() and not self._is_endgame(board):
+            return self.evaluator.evaluate(board, alpha, beta, check_draws=False)
+
+        # Null move pruning (skip if in check, endgame, or shallow depth, or
+        # if the side to move has only pawns, where zugzwang is likely)
+        if (
+            depth >= 3
+            and not board.is_check()
+            and board.occupied_co[board.turn] & ~(board.pawns | board.kings)
+            and not self._is_endgame(board)
+        ):
+            # Reduce more at higher depths
+            reduction = 2 + depth // 6
             board.push(chess.Move.null())
-            null_score = -self._alpha_beta(board, depth - 3, -beta, -beta + 1)
+            null_score = -self._alpha_beta(
+                board, depth - 1 - reduction, -beta, -beta + 1
+            )
             board.pop()
             if null_score >= beta:
                 return beta
@@ -217,22 +451,47 @@ class ChessEngine:
         best_move = None
         original_alpha = alpha
 
-        moves = self._order_moves(board, depth, tt_entry.best_move if tt_entry else None)
+        moves = self._ordered_moves(
+            board, depth, tt_entry.best_move if tt_entry else None
+        )
+        in_check = board.is_check()
+
+        # Bound methods used for every move, looked up once
+        push, pop, is_capture_move = board.push, board.pop, board.is_capture
+        gives_check = board.is_check
+        search = self._alpha_beta
+        history = self.history
 
         for i, move in enumerate(moves):
-            is_capture = board.is_capture(move)
-            board.push(move)
+            is_capture = is_capture_move(move)
+            push(move)
 
-            # Late move reductions - reduce depth for quiet moves after the first few
-            if i >= 4 and depth >= 3 and not is_capture and not move.promotion:
-                score = -self._alpha_beta(board, depth - 2, -alpha - 1, -alpha)
-                # If promising, re-search at full depth
-                if score > alpha:
-                    score = -self._alpha_beta(board, depth - 1, -beta, -alpha)
+            if i == 0:
+                # First (expected best) move gets the full window
+                score = -search(board, depth - 1, -beta, -alpha)
             else:
-                score = -self._alpha_beta(board, depth - 1, -beta, -alpha)
+                # Principal variation search: the rest get a null window.
+                # Late move reductions - reduce depth for quiet moves after
+                # the first few, more so the later and deeper they are
+                reduction = 0
+                if (
+                    i >= 4
+                    and depth >= 3
+                    and not is_capture
+                    and not move.promotion
+                    and not in_check
+                    and not gives_check()
+                ):
+                    reduction = LMR_REDUCTIONS[min(depth, 63)][min(i, 63)]
+                reduced = reduction > 0
+                score = -search(board, depth - 1 - reduction, -alpha - 1, -alpha)
+                # If promising, re-search at full depth
+                if reduced and score > alpha:
+                    score = -search(board, depth - 1, -alpha - 1, -alpha)
+                if alpha < score < beta:
+                    score = -search(board, depth - 1, -beta, -alpha)
 
-            board.pop()
+            pop()
 
             if score > best_score:
                 best_score = score
@@ -243,8 +502,7 @@ class ChessEngine:
 
                 # Update history heuristic for quiet moves
                 if not is_capture:
-                    key = (move.from_square, move.to_square)
-                    self.history[key] = self.history.get(key, 0) + depth * depth
+                    history[move.from_square][move.to_square] += depth * depth
 
             if alpha >= beta:
                 # Beta cutoff - store killer move
@@ -260,7 +518,7 @@ class ChessEngine:
         else:
             node_type = NodeType.EXACT
 
-        self.tt.store(board, depth, best_score, node_type, best_move)
+        self.tt.store(board, depth, best_score, node_type, best_move, hash_key)
 
         return best_score
 
@@ -284,8 +542,10 @@ class ChessEngine:
         """
         self.nodes_searched += 1
 
-        # Stand pat - evaluate current position
-        stand_pat = self.evaluator.evaluate(board)
+        # Stand pat - evaluate current position. Draw claims are checked by
+        # _alpha_beta at the horizon; below it every move is a capture, which
+        # resets the fifty-move counter and cannot repeat a position.
+        stand_pat = self.evaluator.evaluate(board, alpha, beta, check_draws=False)
 
         if depth <= 0:
             return stand_pat
@@ -296,8 +556,25 @@ class ChessEngine:
         if stand_pat > alpha:
             alpha = stand_pat
 
+        # Captures that can't raise the score to alpha aren't searched
+        # (promotions can gain more than the captured piece)
+        futile_below = alpha - stand_pat - DELTA_MARGIN
+        piece_type_at = board.piece_type_at
+
         # Only search captures (and checks at depth > 0)
         for move in self._get_captures(board):
+            if not move.promotion:
+                victim_value = CAPTURE_VALUES[piece_type_at(move.to_square) or 0]
+                if victim_value < futile_below:
+                    continue
+                # Skip captures that lose material in the exchange; taking
+                # a piece at least as valuable as the capturer never does
+                if (
+                    PIECE_VALUES[piece_type_at(move.from_square)] > victim_value
+                    and self._see(board, move) < 0
+                ):
+                    continue
+
             board.push(move)
             score = -self._quiescence(board, -beta, -alpha, depth - 1)
             board.pop()
@@ -310,84 +587,156 @@ class ChessEngine:
 
         return alpha
 
-    def _order_moves(
+    def _ordered_moves(
         self,
         board: chess.Board,
         depth: int,
         hash_move: Optional[chess.Move] = None,
-    ) -> list[chess.Move]:
+    ) -> Iterator[chess.Move]:
         """
-        Order moves for better alpha-beta pruning.
+        Yield legal moves in order for better alpha-beta pruning.
 
-        Move ordering priority:
+        Moves are produced in stages, so after an early beta cutoff the
+        later stages are never generated or sorted:
         1. Hash move (from transposition table)
         2. Captures (ordered by MVV-LVA)
         3. Killer moves
-        4. History heuristic
-        5. Other moves
+        4. Quiet moves: promotions, then by history heuristic
+
+        The board must be restored (push/pop balanced) before each next
+        move is requested.
 
         Args:
             board: The current board position
             depth: Current search depth
             hash_move: Best move from transposition table
 
-        Returns:
-            Ordered list of legal moves
+        Yields:
+            Each legal move exactly once
         """
-        moves = list(board.legal_moves)
-        scored_moves = []
+        # Hash move gets highest priority
+        if hash_move is not None and board.is_legal(hash_move):
+            yield hash_move
+        else:
+            hash_move = None
 
-        for move in moves:
-            score = 0
-
-            # Hash move gets highest priority
-            if move == hash_move:
-                score = 10000000
-            # Captures scored by MVV-LVA
-            elif board.is_capture(move):
-                victim = board.piece_at(move.to_square)
-                attacker = board.piece_at(move.from_square)
-                if victim and attacker:
-                    # MVV-LVA: Most Valuable Victim - Least Valuable Attacker
-                    score = 1000000 + victim.piece_type * 100 - attacker.piece_type
-                else:
-                    score = 1000000
-            # Killer moves
-            elif depth < len(self.killer_moves):
-                if move == self.killer_moves[depth][0]:
-                    score = 900000
-                elif move == self.killer_moves[depth][1]:
-                    score = 800000
-            # Promotions
-            elif move.promotion:
+        # Captures scored by MVV-LVA
+        for move in self._get_captures(board):
+            if move != hash_move:
+                yield move
+
+        # Killer moves (quiet moves that caused cutoffs at this depth)
+        enemy = board.occupied_co[not board.turn]
+        bb_squares = chess.BB_SQUARES
+        is_en_passant = board.is_en_passant
+        killers = ()
+        if depth < len(self.killer_moves):
+            killers = tuple(
+                killer
+                for killer in self.killer_moves[depth]
+                if killer is not None
+                and killer != hash_move
+                and not enemy & bb_squares[killer.to_square]
+                and board.is_legal(killer)
+                and not is_en_passant(killer)
+            )
+            yield from killers
+
+        # Remaining quiet moves: promotions first, then by history
+        history = self.history
+        scored_moves = []
+        for move in board.legal_moves:
+            if (
+                enemy & bb_squares[move.to_square]
+                or move == hash_move
+                or move in killers
+                or is_en_passant(move)
+            ):
+                continue
+            if move.promotion:
                 score = 700000 + move.promotion
-            # History heuristic
             else:
-                key = (move.from_square, move.to_square)
-                score = self.history.get(key, 0)
-
+                score = history[move.from_square][move.to_square]
             scored_moves.append((score, move))
 
         # Sort by score descending
-        scored_moves.sort(key=lambda x: x[0], reverse=True)
-        return [move for _, move in scored_moves]
+        scored_moves.sort(key=itemgetter(0), reverse=True)
+        for _, move in scored_moves:
+            yield move
 
     def _get_captures(self, board: chess.Board) -> list[chess.Move]:
         """Get all capture moves, ordered by MVV-LVA."""
         captures = []
-        for move in board.legal_moves:
-            if board.is_capture(move):
-                victim = board.piece_at(move.to_square)
-                attacker = board.piece_at(move.from_square)
-                if victim and attacker:
-                    score = victim.piece_type * 100 - attacker.piece_type
-                else:
-                    score = 0
-                captures.append((score, move))
-
-        captures.sort(key=lambda x: x[0], reverse=True)
+        piece_type_at = board.piece_type_at
+        for move in board.generate_legal_captures():
+            victim = piece_type_at(move.to_square) or 0
+            score = MVV_LVA[victim][piece_type_at(move.from_square)]
+            captures.append((score, move))
+
+        captures.sort(key=itemgetter(0), reverse=True)
         return [move for _, move in captures]
 
+    def _see(self, board: chess.Board, move: chess.Move) -> int:
+        """
+        Static exchange evaluation of a capture.
+
+        Plays out the exchange on the target square, each side recapturing
+        with its least valuable attacker (x-ray attackers join as pieces in
+        front of them leave) and stopping when recapturing would lose.
+
+        Args:
+            board: The current board position
+            move: A capture (not a promotion) for the side to move
+
+        Returns:
+            Material gained by the side to move, in centipawns
+        """
+        target = move.to_square
+        gains = [CAPTURE_VALUES[board.piece_type_at(target) or 0]]
+        # Value of the piece that now stands on the target square
+        piece_value = PIECE_VALUES[board.piece_type_at(move.from_square)]
+        occupied = board.occupied & ~chess.BB_SQUARES[move.from_square]
+        color = not board.turn
+        pieces = (
+            (board.pawns, PIECE_VALUES[chess.PAWN]),
+            (board.knights, PIECE_VALUES[chess.KNIGHT]),
+            (board.bishops, PIECE_VALUES[chess.BISHOP]),
+            (board.rooks, PIECE_VALUES[chess.ROOK]),
+            (board.queens, PIECE_VALUES[chess.QUEEN]),
+            (board.kings, PIECE_VALUES[chess.KING]),
+        )
+
+        while True:
+            attackers = board.attackers_mask(color, target, occupied) & occupied
+            if not attackers:
+                break
+            for bitboard, value in pieces:
+                if attackers & bitboard:
+                    attacker = attackers & bitboard
+                    attacker &= -attacker  # lowest set bit
+                    break
+
+            # A king can't recapture onto a defended square
+            if value == PIECE_VALUES[chess.KING] and (
+                board.attackers_mask(not color, target, occupied ^ attacker)
+                & occupied
+            ):
+                break
+
+            gains.append(piece_value - gains[-1])
+            # Neither side can come out ahead by continuing
+            if max(-gains[-2], gains[-1]) < 0:
+                break
+            piece_value = value
+            occupied ^= attacker
+            color = not color
+
+        # Each side only recaptures if that is better than stopping
+        while len(gains) > 1:
+            gain = gains.pop()
+            gains[-1] = -max(-gains[-1], gain)
+        return gains[0]
+
     def _store_killer(self, move: chess.Move, depth: int):
         """Store a killer move (caused beta cutoff)."""
         if depth >= len(self.killer_moves):
@@ -399,8 +748,13 @@ class ChessEngine:
             self.killer_moves[depth][0] = move
 
     def _time_up(self) -> bool:
-        """Check if time limit has been exceeded."""
-        return time.time() - self.start_time >= self.time_limit
+        """Check if time limit has been exceeded (or a helper was stopped)."""
+        if not self._timed_out and (
+            time.monotonic_ns() >= self.deadline_ns
+            or (self._stop is not None and self._stop.is_set())
+        ):
+            self._timed_out = True
+        return self._timed_out
 
     def _is_endgame(self, board: chess.Board) -> bool:
         """
@@ -409,19 +763,78 @@ class ChessEngine:
         Heuristic: endgame if total material (excluding pawns) < 15 points
         (roughly: both sides have only rooks, bishops, knights, and pawns)
         """
-        material = 0
-        for piece in board.piece_map().values():
-            # Queen=9, Rook=5, Bishop=3, Knight=3
-            if piece.piece_type == chess.QUEEN:
-                material += 9
-            elif piece.piece_type == chess.ROOK:
-                material += 5
-            elif piece.piece_type in (chess.BISHOP, chess.KNIGHT):
-                material += 3
+        # Queen=9, Rook=5, Bishop=3, Knight=3
+        popcount = chess.popcount
+        material = (
+            9 * popcount(board.queens)
+            + 5 * popcount(board.rooks)
+            + 3 * popcount(board.bishops | board.knights)
+        )
         return material < 15
 
+    def new_game(self):
+        """
+        Prepare for a new game, keeping the transposition table.
+
+        Entries from earlier games stay usable, as openings and common
+        middlegame positions recur. They are also the first to be replaced
+        once a bucket fills, since they carry an older age than the current
+        search's.
+        """
+        self._wait_for_helpers()
+        self.killer_moves = [[None, None] for _ in range(64)]
+        self.history = [[0] * 64 for _ in range(64)]
+
     def reset(self):
-        """Reset engine state for a new game."""
+        """Reset all engine state, including the transposition table."""
+        self.new_game()
         self.tt.clear()
-        self.killer_moves = [[None, None] for _ in range(64)]
-        self.history.clear()
+
+    def close(self):
+        """Stop the helper processes and free the shared table."""
+        if self._pool is not None:
+            self._stop.set()
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._shm is not None:
+            self.tt = TranspositionTable(1)
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+# Lazy SMP helper process state, set up once per process by _init_helper
+_helper_engine: Optional[ChessEngine] = None
+_helper_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _init_helper(shm_name: str, engine_kwargs: dict, stop_event):
+    """Create a helper process's engine on the shared transposition table."""
+    global _helper_engine, _helper_shm
+
+    # Spawned helpers share the parent's resource tracker, which unlinks
+    # the block once, when the parent closes it
+    _helper_shm = shared_memory.SharedMemory(name=shm_name)
+
+    _helper_engine = ChessEngine(**engine_kwargs)
+    _helper_engine.tt = TranspositionTable(
+        engine_kwargs["tt_size_mb"], buffer=_helper_shm.buf
+    )
+    _helper_engine._stop = stop_event
+
+
+def _helper_search(
+    fen: str, moves: list[str], start_depth: int, time_limit: float, age: int
+):
+    """Search a position in a helper process, filling the shared table."""
+    board = ZobristBoard(fen)
+    for move in moves:
+        board.push(chess.Move.from_uci(move))
+
+    _helper_engine.time_limit = time_limit
+    # Write entries with the main search's age, so the searchers don't
+    # treat each other's fresh entries as stale
+    _helper_engine.tt.age = age
+    _helper_engine._iterative_deepening(
+        board, start_depth, report=False, new_search=False
+    )
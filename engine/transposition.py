@@ -3,12 +3,231 @@ Transposition Table for Chess Engine
 
 Uses Zobrist hashing to cache position evaluations and avoid redundant calculations.
 """
-import random
 from dataclasses import dataclass
 from enum import IntEnum
 from typing import Optional
 
 import chess
+import chess.polyglot
+import numpy as np
+
+# Zobrist keys, taken from the Polyglot random array so hashes can be
+# checked against chess.polyglot.zobrist_hash
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+
+# Keys per piece type (index 0 unused), then per color, then per square
+PIECE_KEYS: tuple[Optional[tuple[list[int], list[int]]], ...] = (None,) + tuple(
+    tuple(
+        _RANDOM[64 * offset : 64 * (offset + 1)]
+        for offset in (2 * (piece_type - 1), 2 * (piece_type - 1) + 1)
+    )
+    for piece_type in chess.PIECE_TYPES
+)
+
+# Castling right keys by rook square
+CASTLING_KEYS = {
+    chess.H1: _RANDOM[768],
+    chess.A1: _RANDOM[769],
+    chess.H8: _RANDOM[770],
+    chess.A8: _RANDOM[771],
+}
+
+# En passant keys by file
+EP_KEYS = _RANDOM[772:780]
+
+# XORed in when White is to move
+TURN_KEY = _RANDOM[780]
+
+
+def _castling_hash(castling_rights: chess.Bitboard) -> int:
+    """Hash the castling rights (rook squares that may still castle)."""
+    h = 0
+    for square, key in CASTLING_KEYS.items():
+        if castling_rights & chess.BB_SQUARES[square]:
+            h ^= key
+    return h
+
+
+def zobrist_hash(board: chess.Board) -> int:
+    """
+    Compute the Zobrist hash of a board from scratch.
+
+    Matches chess.polyglot.zobrist_hash, except that the en passant file
+    is hashed whenever an en passant square is set.
+
+    Args:
+        board: The chess board to hash
+
+    Returns:
+        64-bit hash value
+    """
+    h = 0
+
+    # Hash pieces
+    for piece_type in chess.PIECE_TYPES:
+        for color in chess.COLORS:
+            keys = PIECE_KEYS[piece_type][color]
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                h ^= keys[square]
+
+    # Hash side to move
+    if board.turn == chess.WHITE:
+        h ^= TURN_KEY
+
+    # Hash castling rights
+    h ^= _castling_hash(board.castling_rights)
+
+    # Hash en passant
+    if board.ep_square is not None:
+        h ^= EP_KEYS[chess.square_file(board.ep_square)]
+
+    return h
+
+
+class ZobristBoard(chess.Board):
+    """
+    Board that keeps its Zobrist hash up to date as moves are made.
+
+    The hash is updated on push() and restored on pop(), so reading it is
+    O(1) instead of a scan over the whole board. Other ways of editing the
+    position (set_fen(), set_piece_at(), ...) do not update the hash; build
+    a new board with from_board() instead.
+    """
+
+    def __init__(
+        self, fen: Optional[str] = chess.STARTING_FEN, *, chess960: bool = False
+    ):
+        super().__init__(fen, chess960=chess960)
+        self.zobrist = zobrist_hash(self)
+        self._zobrist_stack: list[int] = []
+        # Off while python-chess replays the move stack for repetition
+        # checks; those pops and pushes cancel out and leave the hash as is
+        self._hashing = True
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> "ZobristBoard":
+        """
+        Create a hashing copy of a board, including its move stack.
+
+        Args:
+            board: The board to copy
+
+        Returns:
+            A ZobristBoard for the same position and move history
+        """
+        zobrist_board = cls(board.root().fen(), chess960=board.chess960)
+        for move in board.move_stack:
+            zobrist_board.push(move)
+        return zobrist_board
+
+    def push(self, move: chess.Move):
+        if not self._hashing:
+            super().push(move)
+            return
+
+        before = (
+            self.pawns,
+            self.knights,
+            self.bishops,
+            self.rooks,
+            self.queens,
+            self.kings,
+        )
+        white_before = self.occupied_co[chess.WHITE]
+        black_before = self.occupied_co[chess.BLACK]
+        castling_before = self.castling_rights
+        ep_before = self.ep_square
+
+        super().push(move)
+
+        self._zobrist_stack.append(self.zobrist)
+        h = self.zobrist ^ TURN_KEY
+
+        # XOR out/in every square whose piece changed; this covers captures,
+        # promotions, castling and en passant alike
+        white = self.occupied_co[chess.WHITE]
+        black = self.occupied_co[chess.BLACK]
+        after = (
+            self.pawns,
+            self.knights,
+            self.bishops,
+            self.rooks,
+            self.queens,
+            self.kings,
+        )
+        for (black_keys, white_keys), old, new in zip(PIECE_KEYS[1:], before, after):
+            if old == new and not (old & (white_before ^ white)):
+                continue
+            for square in chess.scan_forward((old & white_before) ^ (new & white)):
+                h ^= white_keys[square]
+            for square in chess.scan_forward((old & black_before) ^ (new & black)):
+                h ^= black_keys[square]
+
+        if self.castling_rights != castling_before:
+            h ^= _castling_hash(castling_before) ^ _castling_hash(self.castling_rights)
+
+        if self.ep_square != ep_before:
+            if ep_before is not None:
+                h ^= EP_KEYS[chess.square_file(ep_before)]
+            if self.ep_square is not None:
+                h ^= EP_KEYS[chess.square_file(self.ep_square)]
+
+        self.zobrist = h
+
+    def pop(self) -> chess.Move:
+        move = super().pop()
+        if self._hashing:
+            self.zobrist = self._zobrist_stack.pop()
+        return move
+
+    def is_hash_repetition(self, count: int = 2) -> bool:
+        """
+        Check whether the position has occurred count times, by its hash.
+
+        Unlike is_repetition(), this doesn't replay the move stack: it only
+        compares the hashes of the earlier positions with the same side to
+        move since the last capture or pawn move. The hash includes the en
+        passant file after every double pawn push, so the position right
+        after one never matches a later one; such a repetition goes unseen.
+
+        Args:
+            count: Number of occurrences, including the current one
+
+        Returns:
+            True if the position occurred at least count times
+        """
+        stack = self._zobrist_stack
+        oldest = max(len(stack) - self.halfmove_clock, 0)
+        seen = 1
+        for index in range(len(stack) - 2, oldest - 1, -2):
+            if stack[index] == self.zobrist:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def is_repetition(self, count: int = 3) -> bool:
+        self._hashing = False
+        try:
+            return super().is_repetition(count)
+        finally:
+            self._hashing = True
+
+    def can_claim_threefold_repetition(self) -> bool:
+        self._hashing = False
+        try:
+            return super().can_claim_threefold_repetition()
+        finally:
+            self._hashing = True
+
+    def copy(self, *, stack=True) -> "ZobristBoard":
+        board = super().copy(stack=stack)
+        board.zobrist = self.zobrist
+        board._hashing = True
+        board._zobrist_stack = self._zobrist_stack[
+            len(self.move_stack) - len(board.move_stack) :
+        ]
+        return board
 
 
 class NodeType(IntEnum):
@@ -19,7 +238,7 @@ class NodeType(IntEnum):
     UPPER_BOUND = 2  # Score is at most this (alpha cutoff)
 
 
-@dataclass
+@dataclass(slots=True)
 class TTEntry:
     """Entry in the transposition table."""
 
@@ -31,94 +250,111 @@ class TTEntry:
     age: int  # When this entry was created
 
 
+# One table slot. Moves are packed as from | to << 6 | promotion << 12
+# (0 = no move) and a zero key marks an empty slot. Scores are float64
+# because the evaluator's weighted terms are not whole centipawns.
+TT_DTYPE = np.dtype(
+    [
+        ("key", np.uint64),
+        ("depth", np.int16),
+        ("score", np.float64),
+        ("node_type", np.uint8),
+        ("move", np.uint16),
+        ("age", np.uint16),
+    ]
+)
+
+# Entries per bucket: a position may be stored in any slot of the bucket its
+# hash selects, so a new entry rarely has to evict a useful one
+BUCKET_SIZE = 4
+
+# NodeType members indexed by their stored value
+_NODE_TYPES = tuple(NodeType)
+
+
+def _encode_move(move: Optional[chess.Move]) -> int:
+    """Pack a move into 16 bits (0 for None)."""
+    if not move:
+        return 0
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def _entry_check(depth: int, score: float, node_type: int, move: int) -> int:
+    """
+    Checksum of an entry's data.
+
+    Shared tables store key ^ checksum, so a row torn by a concurrent write
+    from another process fails the key comparison instead of pairing one
+    entry's key with another's data.
+    """
+    return hash((depth, score, node_type, move)) & 0xFFFFFFFFFFFFFFFF
+
+
+def _decode_move(packed: int) -> Optional[chess.Move]:
+    """Unpack a move stored by _encode_move."""
+    if not packed:
+        return None
+    return chess.Move(packed & 63, (packed >> 6) & 63, (packed >> 12) or None)
+
+
 class TranspositionTable:
     """
     Transposition table using Zobrist hashing.
 
     Stores position evaluations to avoid recalculating the same positions.
+    The table is split into buckets of BUCKET_SIZE consecutive entries.
     """
 
-    def __init__(self, size_mb: int = 256):
+    def __init__(self, size_mb: int = 256, buffer: Optional[memoryview] = None):
         """
         Initialize the transposition table.
 
         Args:
             size_mb: Size of the table in megabytes
+            buffer: Zeroed shared memory of at least nbytes(size_mb) to hold
+                the table, for sharing it between search processes
         """
-        # Calculate number of entries based on size
-        entry_size = 64  # Approximate bytes per entry
-        self.max_entries = (size_mb * 1024 * 1024) // entry_size
-        self.table: dict[int, TTEntry] = {}
+        # Calculate number of entries based on size, rounded down to a power
+        # of two so a bucket's first slot is the hash masked with index_mask
+        self.max_entries = self.nbytes(size_mb) // TT_DTYPE.itemsize
+        self.index_mask = self.max_entries - BUCKET_SIZE
+        self.shared = buffer is not None
+        if self.shared:
+            self._use(np.ndarray(self.max_entries, dtype=TT_DTYPE, buffer=buffer))
+        else:
+            self._allocate()
         self.age = 0
 
-        # Initialize Zobrist keys
-        self._init_zobrist()
-
-    def _init_zobrist(self):
-        """Initialize random Zobrist hash keys."""
-        random.seed(42)  # Deterministic for reproducibility
-
-        # Keys for each piece type on each square
-        # [piece_type][color][square]
-        self.piece_keys = {}
-        for piece_type in chess.PIECE_TYPES:
-            self.piece_keys[piece_type] = {}
-            for color in [chess.WHITE, chess.BLACK]:
-                self.piece_keys[piece_type][color] = [
-                    random.getrandbits(64) for _ in range(64)
-                ]
-
-        # Key for side to move
-        self.side_key = random.getrandbits(64)
-
-        # Keys for castling rights
-        self.castling_keys = {
-            "K": random.getrandbits(64),
-            "Q": random.getrandbits(64),
-            "k": random.getrandbits(64),
-            "q": random.getrandbits(64),
-        }
-
-        # Keys for en passant file
-        self.ep_keys = [random.getrandbits(64) for _ in range(8)]
+    @staticmethod
+    def nbytes(size_mb: int) -> int:
+        """Return the memory a table of size_mb actually uses, in bytes."""
+        max_entries = max((size_mb * 1024 * 1024) // TT_DTYPE.itemsize, BUCKET_SIZE)
+        return (1 << (max_entries.bit_length() - 1)) * TT_DTYPE.itemsize
+
+    def _allocate(self):
+        """Allocate an empty table (zeroed pages are only mapped on first use)."""
+        self._use(np.zeros(self.max_entries, dtype=TT_DTYPE))
+
+    def _use(self, table: np.ndarray):
+        """Switch to the given table array."""
+        self.table = table
+        self._keys = self.table["key"]
+        self._depths = self.table["depth"]
+        self._ages = self.table["age"]
 
     def hash_position(self, board: chess.Board) -> int:
         """
-        Compute Zobrist hash for a board position.
+        Get the Zobrist hash for a board position.
 
         Args:
             board: The chess board to hash
 
         Returns:
-            64-bit hash value
+            64-bit hash value (kept incrementally by a ZobristBoard)
         """
-        h = 0
-
-        # Hash pieces
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                h ^= self.piece_keys[piece.piece_type][piece.color][square]
-
-        # Hash side to move
-        if board.turn == chess.BLACK:
-            h ^= self.side_key
-
-        # Hash castling rights
-        if board.has_kingside_castling_rights(chess.WHITE):
-            h ^= self.castling_keys["K"]
-        if board.has_queenside_castling_rights(chess.WHITE):
-            h ^= self.castling_keys["Q"]
-        if board.has_kingside_castling_rights(chess.BLACK):
-            h ^= self.castling_keys["k"]
-        if board.has_queenside_castling_rights(chess.BLACK):
-            h ^= self.castling_keys["q"]
-
-        # Hash en passant
-        if board.ep_square is not None:
-            h ^= self.ep_keys[chess.square_file(board.ep_square)]
-
-        return h
+        if isinstance(board, ZobristBoard):
+            return board.zobrist
+        return zobrist_hash(board)
 
     def store(
         self,
@@ -127,6 +363,7 @@ class TranspositionTable:
         score: int,
         node_type: NodeType,
         best_move: Optional[chess.Move] = None,
+        hash_key: Optional[int] = None,
     ):
         """
         Store a position evaluation in the table.
@@ -137,54 +374,88 @@ class TranspositionTable:
             score: The evaluation score
             node_type: Type of score bound
             best_move: Best move found (if any)
+            hash_key: The board's hash, if the caller already has it
         """
-        hash_key = self.hash_position(board)
-        index = hash_key % self.max_entries
-
-        # Check if we should replace existing entry
-        existing = self.table.get(index)
-        if existing is not None:
-            # Replace if:
-            # 1. Different position (collision)
-            # 2. Deeper search
-            # 3. Same depth but newer
-            if existing.hash_key != hash_key or depth >= existing.depth:
-                self.table[index] = TTEntry(
-                    hash_key=hash_key,
-                    depth=depth,
-                    score=score,
-                    node_type=node_type,
-                    best_move=best_move,
-                    age=self.age,
-                )
+        if hash_key is None:
+            hash_key = self.hash_position(board)
+        base = hash_key & self.index_mask
+        age = self.age & 0xFFFF
+
+        if self.shared:
+            rows = self.table[base : base + BUCKET_SIZE].tolist()
+            # Stored keys are XOR-ed with a checksum, so an empty row only
+            # shows as 0 before it is undone
+            raw_keys = [row[0] for row in rows]
+            keys = [row[0] ^ _entry_check(*row[1:5]) for row in rows]
+            depths = [row[1] for row in rows]
+            ages = [row[5] for row in rows]
+        else:
+            keys = raw_keys = self._keys[base : base + BUCKET_SIZE].tolist()
+            depths = self._depths[base : base + BUCKET_SIZE].tolist()
+            ages = self._ages[base : base + BUCKET_SIZE].tolist()
+
+        if hash_key in keys:
+            # Same position: only replace a shallower (or equal) result
+            slot = keys.index(hash_key)
+            if depth < depths[slot]:
+                return
+        elif 0 in raw_keys:
+            slot = raw_keys.index(0)
         else:
-            self.table[index] = TTEntry(
-                hash_key=hash_key,
-                depth=depth,
-                score=score,
-                node_type=node_type,
-                best_move=best_move,
-                age=self.age,
+            # Evict an entry left from an earlier search first, then the
+            # shallowest one
+            slot = min(
+                range(BUCKET_SIZE), key=lambda i: (ages[i] == age, depths[i])
             )
 
-    def probe(self, board: chess.Board) -> Optional[TTEntry]:
+        move = _encode_move(best_move)
+        if self.shared:
+            hash_key ^= _entry_check(depth, score, node_type, move)
+        self.table[base + slot] = (hash_key, depth, score, node_type, move, age)
+
+    def probe(
+        self, board: chess.Board, hash_key: Optional[int] = None
+    ) -> Optional[TTEntry]:
         """
         Look up a position in the table.
 
         Args:
             board: The chess board to look up
+            hash_key: The board's hash, if the caller already has it
 
         Returns:
             TTEntry if found and hash matches, None otherwise
         """
-        hash_key = self.hash_position(board)
-        index = hash_key % self.max_entries
-
-        entry = self.table.get(index)
-        if entry is not None and entry.hash_key == hash_key:
-            return entry
-
-        return None
+        if hash_key is None:
+            hash_key = self.hash_position(board)
+        base = hash_key & self.index_mask
+
+        if self.shared:
+            # Read each row once, then validate it against its checksum
+            for key, depth, score, node_type, move, age in self.table[
+                base : base + BUCKET_SIZE
+            ].tolist():
+                if key ^ _entry_check(depth, score, node_type, move) == hash_key:
+                    break
+            else:
+                return None
+        else:
+            # Compare as Python ints; NumPy < 2 compares uint64 with int as float
+            keys = self._keys[base : base + BUCKET_SIZE].tolist()
+            if hash_key not in keys:
+                return None
+            _, depth, score, node_type, move, age = self.table[
+                base + keys.index(hash_key)
+            ].item()
+
+        return TTEntry(
+            hash_key=hash_key,
+            depth=depth,
+            score=score,
+            node_type=_NODE_TYPES[node_type],
+            best_move=_decode_move(move),
+            age=age,
+        )
 
     def get_pv_line(self, board: chess.Board, max_length: int = 10) -> list[chess.Move]:
         """
@@ -220,9 +491,12 @@ class TranspositionTable:
 
     def clear(self):
         """Clear all entries from the table."""
-        self.table.clear()
+        if self.shared:
+            self.table.fill(0)
+        else:
+            self._allocate()
         self.age = 0
 
     def fill_rate(self) -> float:
         """Return the percentage of table slots filled."""
-        return len(self.table) / self.max_entries * 100
+        return np.count_nonzero(self._keys) / self.max_entries * 100
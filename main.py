@@ -8,6 +8,7 @@ endgame tablebase, and browser automation to play chess on chess.com.
 import argparse
 import asyncio
 import sys
+import traceback
 from pathlib import Path
 
 import chess
@@ -24,6 +25,30 @@ from automation.move_executor import MoveExecutor
 from tui import select_game_mode
 
 
+# Longest wait for a board change before play_game rechecks for game over
+BOARD_WAIT_TIMEOUT = 1.0
+
+# Result message for each (result, our color)
+_RESULT_STRINGS = {
+    (GameResult.WHITE_WINS, chess.WHITE): "Victory! (White wins)",
+    (GameResult.WHITE_WINS, chess.BLACK): "Defeat (White wins)",
+    (GameResult.BLACK_WINS, chess.BLACK): "Victory! (Black wins)",
+    (GameResult.BLACK_WINS, chess.WHITE): "Defeat (Black wins)",
+    (GameResult.DRAW, chess.WHITE): "Draw",
+    (GameResult.DRAW, chess.BLACK): "Draw",
+}
+
+
+def _same_placement(a: chess.BaseBoard, b: chess.BaseBoard) -> bool:
+    """
+    Check whether two boards have the same pieces on the same squares.
+
+    Compares the piece bitboards only (BaseBoard equality), ignoring turn,
+    castling rights and move counters, without building FEN strings.
+    """
+    return chess.BaseBoard.__eq__(a, b)
+
+
 class ChessBot:
     """
     Main chess bot that plays on chess.com.
@@ -51,6 +76,7 @@ class ChessBot:
             use_quiescence=self.settings.use_quiescence,
             quiescence_depth=self.settings.quiescence_depth,
             tt_size_mb=self.settings.tt_size_mb,
+            threads=self.settings.search_threads,
         )
 
         # Initialize opening book
@@ -75,9 +101,15 @@ class ChessBot:
 
         # Game state
         self.player_color: bool = chess.WHITE
+        # Board orientation on screen, fixed for the game (Black plays flipped)
+        self.is_flipped: bool = False
         self.internal_board: chess.Board = chess.Board()
         self.move_count = 0
-        self.last_board_fen: str = ""
+        # Set once the book has no move for a position; a game that has
+        # left the book almost never comes back to it
+        self._book_exhausted = False
+        # BoardReader revision of the last position handled (-1 = none)
+        self.last_board_rev: int = -1
 
     async def initialize(self):
         """Initialize the browser and connect to chess.com."""
@@ -125,14 +157,17 @@ class ChessBot:
 
                 # Detect player color
                 self.player_color = await self.game_detector.detect_player_color()
+                self.is_flipped = self.player_color == chess.BLACK
                 color_name = "White" if self.player_color == chess.WHITE else "Black"
                 print(f"\nGame started! Playing as {color_name}")
 
                 # Reset for new game
-                self.internal_board = chess.Board()
+                self.internal_board.reset()
                 self.move_count = 0
-                self.last_board_fen = ""
-                self.engine.reset()
+                self._book_exhausted = False
+                self.last_board_rev = -1
+                self.engine.new_game()
+                self.board_reader.reset()
 
                 # Play the game
                 result = await self.play_game()
@@ -147,7 +182,6 @@ class ChessBot:
             print("\nBot stopped by user")
         except Exception as e:
             print(f"Error: {e}")
-            import traceback
             traceback.print_exc()
         finally:
             await self.cleanup()
@@ -162,35 +196,43 @@ class ChessBot:
         consecutive_same_board = 0
 
         while True:
-            # Check if game is over
-            is_over, result = await self.game_detector.is_game_over()
-            if is_over:
-                return self._format_result(result)
-
-            # Read current board state from chess.com
+            # Check if game is over and if the board has changed since the
+            # last check, in one page call; only the observed piece changes
+            # are fetched, no board is built
             try:
-                current_board = await self.board_reader.read_board()
-                current_fen = current_board.fen().split()[0]  # Just piece positions
+                is_over, result, board_rev = await self.game_detector.poll(
+                    self.board_reader
+                )
             except Exception as e:
                 print(f"Error reading board: {e}")
                 await asyncio.sleep(0.5)
                 continue
 
-            # Check if board has changed since last check
-            if current_fen == self.last_board_fen:
+            if is_over:
+                return self._format_result(result)
+
+            if board_rev == self.last_board_rev:
                 consecutive_same_board += 1
-                if consecutive_same_board > 20:  # ~10 seconds of no change
+                if consecutive_same_board > 10:  # ~10 seconds of no change
                     print("Board unchanged for too long, checking game state...")
                     state = await self.game_detector.get_game_state()
                     if state == GameState.GAME_OVER:
                         return "Game ended"
                     consecutive_same_board = 0
-                await asyncio.sleep(0.5)
+                await self._wait_for_board_change()
                 continue
 
             # Board changed!
             consecutive_same_board = 0
-            self.last_board_fen = current_fen
+
+            # Read current board state from chess.com
+            try:
+                current_board = await self.board_reader.read_board()
+            except Exception as e:
+                print(f"Error reading board: {e}")
+                await asyncio.sleep(0.5)
+                continue
+            self.last_board_rev = self.board_reader.revision
 
             # Sync our internal board with what we see on screen
             self._sync_board(current_board)
@@ -201,7 +243,7 @@ class ChessBot:
 
             if not is_our_turn:
                 # Not our turn, wait for opponent
-                await asyncio.sleep(0.3)
+                await self._wait_for_board_change()
                 continue
 
             # It's our turn! Calculate and make a move
@@ -212,8 +254,9 @@ class ChessBot:
                 await asyncio.sleep(1)
                 continue
 
-            # Validate move is legal
-            if best_move not in self.internal_board.legal_moves:
+            # Validate move is legal (a single-move check, not a scan of
+            # all legal moves)
+            if not self.internal_board.is_legal(best_move):
                 print(f"Move {best_move} not legal, recalculating...")
                 # Re-sync and recalculate
                 self.internal_board = current_board.copy()
@@ -226,7 +269,7 @@ class ChessBot:
 
             success = await self.move_executor.make_move(
                 best_move,
-                is_flipped=(self.player_color == chess.BLACK),
+                is_flipped=self.is_flipped,
             )
 
             if success:
@@ -240,17 +283,27 @@ class ChessBot:
                 # IMPORTANT: Wait for the move to register and opponent to potentially move
                 await asyncio.sleep(1.0)
 
-                # Update last_board_fen to prevent re-triggering
-                try:
-                    new_board = await self.board_reader.read_board()
-                    self.last_board_fen = new_board.fen().split()[0]
-                except Exception:
-                    pass
+                # No re-read here: the next poll sees our own move as a new
+                # revision, finds it matches internal_board and waits for the
+                # opponent, while an opponent reply in the meantime is not
+                # mistaken for the position we already handled
 
             await asyncio.sleep(0.5)
 
         return "Game ended"
 
+    async def _wait_for_board_change(self):
+        """
+        Wait until the board changes, or at most BOARD_WAIT_TIMEOUT.
+
+        The wait blocks in the page on its MutationObserver, so an idle
+        board costs no reads and a move wakes the loop right away.
+        """
+        try:
+            await self.board_reader.wait_for_board_change(timeout=BOARD_WAIT_TIMEOUT)
+        except Exception:
+            await asyncio.sleep(0.5)
+
     def _is_our_turn(self, current_board: chess.Board) -> bool:
         """
         Determine if it's our turn based on piece positions.
@@ -258,12 +311,9 @@ class ChessBot:
         We compare the current board to our internal board to see
         if the opponent has moved.
         """
-        current_pieces = current_board.fen().split()[0]
-        internal_pieces = self.internal_board.fen().split()[0]
-
         # If boards match and it was previously our turn after we moved,
         # then it's opponent's turn now
-        if current_pieces == internal_pieces:
+        if _same_placement(current_board, self.internal_board):
             # Board hasn't changed - check if we just moved
             # If internal_board.turn != our color, we already moved
             return self.internal_board.turn == self.player_color
@@ -282,32 +332,36 @@ class ChessBot:
         Returns:
             The best move found
         """
-        # Make sure internal board has correct turn
-        self.internal_board.turn = self.player_color
+        # Make sure internal board has correct turn. It normally already
+        # does; only write it when it doesn't, since overwriting the turn of
+        # a board with a move stack makes the stack inconsistent
+        if self.internal_board.turn != self.player_color:
+            self.internal_board.turn = self.player_color
 
         # 1. Try opening book (first ~10 moves)
         if (
             self.settings.use_opening_book
+            and not self._book_exhausted
             and self.internal_board.fullmove_number <= self.settings.opening_book_depth
         ):
             book_move = self.opening_book.get_move(self.internal_board)
             if book_move:
                 print("(Opening book)")
                 return book_move
+            self._book_exhausted = True
 
         # 2. Try endgame tablebase
         if self.tablebase.enabled:
-            tb_move = self.tablebase.get_best_move(self.internal_board)
+            tb_move = await self.tablebase.get_best_move_async(self.internal_board)
             if tb_move:
                 print("(Tablebase)")
                 return tb_move
 
-        # 3. Use the engine
+        # 3. Use the engine. The search runs inline: nothing else needs the
+        # event loop while we think, and a worker thread would only contend
+        # with it for the GIL
         print("(Calculating...)")
-        best_move = await asyncio.to_thread(
-            self.engine.find_best_move,
-            self.internal_board,
-        )
+        best_move = self.engine.find_best_move(self.internal_board)
 
         return best_move
 
@@ -318,33 +372,25 @@ class ChessBot:
         This handles cases where moves were made that we missed.
         """
         # Compare piece positions (ignore move counters)
-        internal_pieces = self.internal_board.fen().split()[0]
-        actual_pieces = actual_board.fen().split()[0]
-
-        if internal_pieces != actual_pieces:
+        if not _same_placement(self.internal_board, actual_board):
             # Board has changed - copy the new state
             self.internal_board = actual_board.copy()
             # Set turn to our color (we'll verify this separately)
-            self.internal_board.turn = self.player_color
+            if self.internal_board.turn != self.player_color:
+                self.internal_board.turn = self.player_color
 
     def _format_result(self, result: GameResult) -> str:
         """Format game result as string."""
-        if result == GameResult.WHITE_WINS:
-            if self.player_color == chess.WHITE:
-                return "Victory! (White wins)"
-            return "Defeat (White wins)"
-        elif result == GameResult.BLACK_WINS:
-            if self.player_color == chess.BLACK:
-                return "Victory! (Black wins)"
-            return "Defeat (Black wins)"
-        elif result == GameResult.DRAW:
-            return "Draw"
-        return "Unknown result"
+        return _RESULT_STRINGS.get((result, self.player_color), "Unknown result")
 
     async def cleanup(self):
         """Clean up resources."""
         if self.tablebase:
             self.tablebase.close()
+        if self.opening_book:
+            self.opening_book.close()
+        if self.engine:
+            self.engine.close()
         if self.browser:
             await self.browser.close()
 
@@ -385,6 +431,12 @@ async def main():
         type=float,
         help="Maximum delay before moving (seconds) - overrides mode setting",
     )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Number of search processes sharing the transposition table",
+    )
     parser.add_argument(
         "--headless",
         action="store_true",
@@ -427,6 +479,7 @@ async def main():
         time_limit=args.time_limit or game_mode.time_limit,
         min_move_delay=args.min_delay or game_mode.min_delay,
         max_move_delay=args.max_delay or game_mode.max_delay,
+        search_threads=args.threads,
         headless=args.headless,
         use_opening_book=not args.no_book,
         chess_com_url=args.url,
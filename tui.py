@@ -5,37 +5,107 @@ Interactive Text User Interface for Chess Bot Game Mode Selection
 Provides a curses-based menu for selecting game modes before launching.
 Falls back to simple text UI if curses is not available.
 """
+import os
+import shutil
 import sys
 from typing import Optional
 
+try:
+    import curses
+
+    _HAS_CURSES = True
+except ImportError:  # e.g. Windows without windows-curses
+    _HAS_CURSES = False
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows: no raw terminal reads
+    termios = None
+
 from config.game_modes import GAME_MODES, GameMode, list_game_modes
 
+# Smallest terminal (columns, lines) the curses menu fits in
+_MIN_TERMINAL_SIZE = (60, 20)
+
+# Dividers of the plain-text menu and mode details
+_DIV_EQ = "=" * 60
+_DIV_DASH = "-" * 60
+
+# $TERM values that cannot drive a curses screen
+_DUMB_TERMS = ("dumb", "unknown")
+
+# Header of the plain-text menu
+_SIMPLE_MENU_HEADER = "\n".join(
+    [
+        "\n" + _DIV_EQ,
+        "           ♟  CHESS BOT - GAME MODE SELECTOR  ♟",
+        _DIV_EQ,
+        "",
+        "Available Game Modes:",
+        "",
+    ]
+)
+
+# Static parts of the curses menu
+_MENU_TITLE = "♟  CHESS BOT - GAME MODE SELECTOR  ♟"
+_MENU_DIVIDER = "─" * 50
+_MENU_FOOTER = "↑↓ Navigate | Enter: Select | Q: Quit"
+
+# Answer for each key accepted by the confirmation prompt
+_CONFIRM_KEYS = {ord("y"): True, ord("Y"): True, ord("n"): False, ord("N"): False}
+
+
+def _getch() -> str:
+    """Read one key press from stdin without waiting for Enter.
+
+    Returns:
+        The character typed.
+    """
+    fd = sys.stdin.fileno()
+    old_attrs = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)  # No line buffering or echo; Ctrl+C still works
+        return sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+
 
 class SimpleTUI:
     """Simple text-based UI fallback (no curses dependency)."""
 
     def __init__(self):
         self.modes = list_game_modes()
+        # Details block printed for each mode, built once
+        self._details = {
+            mode_id: self._format_mode_details(mode) for mode_id, mode in self.modes
+        }
+        # Whole menu, so each render is a single write
+        self._menu_text = "\n".join(
+            [_SIMPLE_MENU_HEADER]
+            + [
+                f"  [{idx}] {mode.display_name:20s} - {mode.description}"
+                for idx, (mode_id, mode) in enumerate(self.modes, 1)
+            ]
+            + ["", "  [0] Exit", "", ""]
+        )
+        # Answer prompts with a single key press when every menu choice is
+        # one digit and stdin is a terminal; otherwise read whole lines
+        self._single_key = (
+            termios is not None and sys.stdin.isatty() and len(self.modes) <= 9
+        )
 
     def show_menu(self) -> Optional[str]:
         """Display menu and get user selection."""
-        print("\n" + "=" * 60)
-        print("           ♟  CHESS BOT - GAME MODE SELECTOR  ♟")
-        print("=" * 60)
-        print()
-        print("Available Game Modes:")
-        print()
-
-        for idx, (mode_id, mode) in enumerate(self.modes, 1):
-            print(f"  [{idx}] {mode.display_name:20s} - {mode.description}")
-
-        print()
-        print("  [0] Exit")
-        print()
+        sys.stdout.write(self._menu_text)
+        sys.stdout.flush()
 
         while True:
             try:
-                choice = input("Select game mode (1-8, or 0 to exit): ").strip()
+                choice = self._prompt("Select game mode (1-8, or 0 to exit): ")
+                if not choice.isdecimal():  # Digits only; rejects signs and underscores
+                    print("Invalid input. Please enter a number.")
+                    continue
                 choice_num = int(choice)
 
                 if choice_num == 0:
@@ -44,52 +114,76 @@ class SimpleTUI:
                 if 1 <= choice_num <= len(self.modes):
                     selected_mode_id, selected_mode = self.modes[choice_num - 1]
                     self._show_mode_details(selected_mode_id, selected_mode)
-                    confirm = (
-                        input(
-                            "\nStart bot with this mode? (y/n): "
-                        )
-                        .strip()
-                        .lower()
-                    )
-                    if confirm == "y":
+                    confirm = self._prompt("\nStart bot with this mode? (y/n): ")
+                    if confirm in ("y", "Y"):
                         return selected_mode_id
                     else:
                         print("\nReturning to menu...")
                 else:
                     print("Invalid choice. Please try again.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
             except KeyboardInterrupt:
                 return None
 
+    def _prompt(self, prompt: str) -> str:
+        """Show a prompt and read the user's answer.
+
+        Args:
+            prompt: Text shown before the answer.
+
+        Returns:
+            The key pressed (or line entered), stripped of whitespace.
+        """
+        if not self._single_key:
+            return input(prompt).strip()
+        print(prompt, end="", flush=True)
+        key = _getch()
+        print(key.strip())  # Echo the key and end the prompt line
+        return key.strip()
+
     def _show_mode_details(self, mode_id: str, mode: GameMode):
         """Display details of a selected mode."""
-        print("\n" + "-" * 60)
-        print(f"Mode: {mode.display_name}")
-        print("-" * 60)
-        print(f"  Time Control:        {mode.time_seconds}s + {mode.increment}s")
-        print(f"  Engine Depth:        {mode.search_depth} ply")
-        print(f"  Time Per Move:       {mode.time_limit:.1f}s")
-        print(f"  Move Delay:          {mode.min_delay:.1f}s - {mode.max_delay:.1f}s")
-        print(f"  Description:         {mode.description}")
-        print("-" * 60)
+        details = self._details.get(mode_id)
+        if details is None:
+            details = self._format_mode_details(mode)
+        sys.stdout.write(details + "\n")
+        sys.stdout.flush()
+
+    @staticmethod
+    def _format_mode_details(mode: GameMode) -> str:
+        """Format the details block of a mode."""
+        return "\n".join(
+            [
+                "\n" + _DIV_DASH,
+                f"Mode: {mode.display_name}",
+                _DIV_DASH,
+                f"  Time Control:        {mode.time_seconds}s + {mode.increment}s",
+                f"  Engine Depth:        {mode.search_depth} ply",
+                f"  Time Per Move:       {mode.time_limit:.1f}s",
+                f"  Move Delay:          {mode.min_delay:.1f}s - {mode.max_delay:.1f}s",
+                f"  Description:         {mode.description}",
+                _DIV_DASH,
+            ]
+        )
 
 
 class CursesTUI:
     """Curses-based terminal UI with enhanced interactivity."""
 
     def __init__(self):
-        try:
-            import curses
-
-            self.curses = curses
-            self.enabled = True
-        except ImportError:
-            self.enabled = False
+        self.enabled = _HAS_CURSES
+        if not self.enabled:
             return
 
         self.modes = list_game_modes()
         self.selected_idx = 0
+        self._last_idx = len(self.modes) - 1
+        # Text of each menu row after the "> " marker, built once: the label
+        # fills columns 4-21 and the description starts at column 22
+        self._rows = [
+            f"[{idx + 1}] {mode.display_name:12} ".ljust(18)[:18]
+            + mode.description[: 50 - 22]
+            for idx, (mode_id, mode) in enumerate(self.modes)
+        ]
 
     def show_menu(self) -> Optional[str]:
         """Display interactive menu using curses."""
@@ -97,86 +191,108 @@ class CursesTUI:
             return None
 
         try:
-            return self.curses.wrapper(self._run_menu)
+            return curses.wrapper(self._run_menu)
         except Exception:
             # Fall back to simple UI on error
             return None
 
     def _run_menu(self, stdscr):
         """Main menu loop (called by curses.wrapper)."""
-        self.curses.curs_set(0)  # Hide cursor
-        stdscr.nodelay(1)  # Non-blocking getch()
+        curses.curs_set(0)  # Hide cursor
+        stdscr.keypad(True)  # Arrow keys as KEY_UP/KEY_DOWN; getch() blocks
 
         max_y, max_x = stdscr.getmaxyx()
-        if max_x < 60 or max_y < 20:
+        if max_x < _MIN_TERMINAL_SIZE[0] or max_y < _MIN_TERMINAL_SIZE[1]:
             return None  # Terminal too small
 
         # Initialize colors
-        self.curses.init_pair(1, self.curses.COLOR_CYAN, self.curses.COLOR_BLACK)
-        self.curses.init_pair(2, self.curses.COLOR_WHITE, self.curses.COLOR_BLUE)
-        self.curses.init_pair(3, self.curses.COLOR_GREEN, self.curses.COLOR_BLACK)
-        self.curses.init_pair(4, self.curses.COLOR_YELLOW, self.curses.COLOR_BLACK)
+        curses.init_pair(1, curses.COLOR_CYAN, curses.COLOR_BLACK)
+        curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_BLUE)
+        curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(4, curses.COLOR_YELLOW, curses.COLOR_BLACK)
 
         selected = None
+        redraw = True
 
         while True:
-            stdscr.clear()
-            self._draw_menu(stdscr)
-            stdscr.refresh()
-
+            # Full repaint only on first paint, resize, or after the
+            # confirmation screen; erase() (unlike clear()) lets curses send
+            # just the cells that differ from what the terminal shows
+            if redraw:
+                stdscr.erase()
+                self._draw_menu(stdscr)
+                stdscr.refresh()
+                redraw = False
+
+            # Sleeps until a key is pressed
             ch = stdscr.getch()
-            if ch == -1:  # No input
-                continue
-            elif ch in (self.curses.KEY_UP, ord("w")):
-                self.selected_idx = max(0, self.selected_idx - 1)
-            elif ch in (self.curses.KEY_DOWN, ord("s")):
-                self.selected_idx = min(len(self.modes) - 1, self.selected_idx + 1)
+            if ch in (curses.KEY_UP, ord("w")):
+                self._move_selection(stdscr, self.selected_idx - 1)
+            elif ch in (curses.KEY_DOWN, ord("s")):
+                self._move_selection(stdscr, self.selected_idx + 1)
             elif ch == ord("\n"):  # Enter
                 selected = self._confirm_selection(stdscr)
                 if selected is not None:
                     return selected
+                redraw = True  # The confirmation screen replaced the menu
+            elif ch == curses.KEY_RESIZE:
+                redraw = True
             elif ch == ord("q"):
                 return None
 
     def _draw_menu(self, stdscr):
         """Draw the menu."""
-        stdscr.addstr(
-            1, 2, "♟  CHESS BOT - GAME MODE SELECTOR  ♟", self.curses.color_pair(1)
-        )
+        stdscr.addstr(1, 2, _MENU_TITLE, curses.color_pair(1))
+
+        stdscr.addstr(3, 2, "SELECT GAME MODE", curses.color_pair(4))
+        stdscr.addstr(4, 2, _MENU_DIVIDER)
+
+        for idx in range(len(self.modes)):
+            self._draw_row(stdscr, idx, idx == self.selected_idx)
 
-        stdscr.addstr(3, 2, "SELECT GAME MODE", self.curses.color_pair(4))
-        stdscr.addstr(4, 2, "─" * 50)
-
-        for idx, (mode_id, mode) in enumerate(self.modes):
-            y = 6 + idx
-            if idx == self.selected_idx:
-                stdscr.addstr(y, 2, f"> ", self.curses.color_pair(2))
-                stdscr.addstr(
-                    y, 4, f"[{idx + 1}] {mode.display_name:12} ", self.curses.color_pair(2)
-                )
-                stdscr.addstr(
-                    y, 22, mode.description[: 50 - 22], self.curses.color_pair(2)
-                )
-            else:
-                stdscr.addstr(y, 2, "  ", self.curses.color_pair(3))
-                stdscr.addstr(y, 4, f"[{idx + 1}] {mode.display_name:12} ", self.curses.color_pair(3))
-                stdscr.addstr(y, 22, mode.description[: 50 - 22], self.curses.color_pair(3))
-
-        stdscr.addstr(6 + len(self.modes) + 2, 2, "─" * 50)
+        stdscr.addstr(6 + len(self.modes) + 2, 2, _MENU_DIVIDER)
         stdscr.addstr(
-            6 + len(self.modes) + 3,
-            2,
-            "↑↓ Navigate | Enter: Select | Q: Quit",
-            self.curses.color_pair(4),
+            6 + len(self.modes) + 3, 2, _MENU_FOOTER, curses.color_pair(4)
         )
 
+    def _draw_row(self, stdscr, idx: int, highlighted: bool):
+        """Draw one mode row of the menu."""
+        if highlighted:
+            stdscr.addstr(6 + idx, 2, "> " + self._rows[idx], curses.color_pair(2))
+        else:
+            stdscr.addstr(6 + idx, 2, "  " + self._rows[idx], curses.color_pair(3))
+
+    def _move_selection(self, stdscr, new_idx: int):
+        """Move the highlight, repainting only the two rows that change."""
+        # Steps are one row, so an index past either end means the highlight
+        # is already at the edge
+        if not 0 <= new_idx <= self._last_idx:
+            return
+
+        self._draw_row(stdscr, self.selected_idx, False)
+        self._draw_row(stdscr, new_idx, True)
+        self.selected_idx = new_idx
+        stdscr.refresh()
+
     def _confirm_selection(self, stdscr):
         """Show confirmation for selected mode."""
         mode_id, mode = self.modes[self.selected_idx]
+        self._draw_confirmation(stdscr, mode)
 
-        stdscr.clear()
-        stdscr.addstr(1, 2, f"Mode: {mode.display_name}", self.curses.color_pair(1))
-        stdscr.addstr(2, 2, "─" * 50)
+        # getch() blocks; other keys are ignored
+        while True:
+            ch = stdscr.getch()
+            answer = _CONFIRM_KEYS.get(ch)
+            if answer is not None:
+                return mode_id if answer else None
+            if ch == curses.KEY_RESIZE:
+                self._draw_confirmation(stdscr, mode)
+
+    def _draw_confirmation(self, stdscr, mode: GameMode):
+        """Draw the confirmation screen for a mode."""
+        stdscr.erase()
+        stdscr.addstr(1, 2, f"Mode: {mode.display_name}", curses.color_pair(1))
+        stdscr.addstr(2, 2, _MENU_DIVIDER)
 
         details = [
             f"  Time Control:    {mode.time_seconds}s + {mode.increment}s",
@@ -189,16 +305,20 @@ class CursesTUI:
         for idx, detail in enumerate(details):
             stdscr.addstr(4 + idx, 2, detail)
 
-        stdscr.addstr(10, 2, "─" * 50)
-        stdscr.addstr(11, 2, "Start bot with this mode? (Y/N)", self.curses.color_pair(4))
+        stdscr.addstr(10, 2, _MENU_DIVIDER)
+        stdscr.addstr(11, 2, "Start bot with this mode? (Y/N)", curses.color_pair(4))
         stdscr.refresh()
 
-        while True:
-            ch = stdscr.getch()
-            if ch == ord("y") or ch == ord("Y"):
-                return mode_id
-            elif ch == ord("n") or ch == ord("N"):
-                return None
+
+def _prefer_simple_ui() -> bool:
+    """Check whether the environment asks for the plain-text menu.
+
+    Returns:
+        True if CHESSBOT_SIMPLE_UI is set or $TERM cannot run curses.
+    """
+    if os.environ.get("CHESSBOT_SIMPLE_UI"):
+        return True
+    return os.environ.get("TERM") in _DUMB_TERMS
 
 
 def select_game_mode() -> Optional[str]:
@@ -208,17 +328,17 @@ def select_game_mode() -> Optional[str]:
     Returns:
         Selected game mode ID, or None if cancelled/exited.
     """
-    # Try curses first, fall back to simple TUI
-    if sys.stdout.isatty():
-        tui = CursesTUI()
-        if tui.enabled:
-            result = tui.show_menu()
+    # Try curses first, fall back to simple TUI. The terminal size is checked
+    # up front so a too-small terminal never enters (and clears) curses
+    if sys.stdout.isatty() and _HAS_CURSES and not _prefer_simple_ui():
+        columns, lines = shutil.get_terminal_size()
+        if columns >= _MIN_TERMINAL_SIZE[0] and lines >= _MIN_TERMINAL_SIZE[1]:
+            result = CursesTUI().show_menu()
             if result is not None:
                 return result
 
     # Fall back to simple text UI
-    simple_tui = SimpleTUI()
-    return simple_tui.show_menu()
+    return SimpleTUI().show_menu()
 
 
 if __name__ == "__main__":